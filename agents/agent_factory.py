@@ -1,12 +1,11 @@
-from langchain.agents import initialize_agent, AgentType
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+import threading
+from functools import lru_cache
 
 from intents.intent_detector import filter_tools_by_intent
-from config import llm
-from utils.utils import format_conversation_for_agent
+from config import get_llm
 
 # 모든 툴을 import 해서 리스트로 만들어둡니다.
-from tools.search_tools import search_place
+from tools.search_tools import search_place, search_places_batch
 from tools.calendar_tools import (
     check_event_exists,
     create_event_tool,
@@ -19,6 +18,7 @@ from tools.share_tools import share_gist_tool, share_travel_plan_gist, debug_sha
 
 all_tools = [
     search_place,
+    search_places_batch,
     plan_trip_tool,
     create_calendar_from_plan,
     create_event_tool,
@@ -31,35 +31,34 @@ all_tools = [
     debug_share_status,
 ]
 
-def create_intent_based_agent(intent: str, user_input: str):
-    """
-    인텐트에 따라 특정 도구만 사용하는 에이전트 생성 (파싱 오류 방지)
-    """
-    filtered_tools = filter_tools_by_intent(intent, all_tools)
-
-    intent_prompts = {
-        "PLAN_TRIP": """너는 여행 계획 전문가입니다.
+# ========================================
+# 인텐트별 프롬프트 (프로세스 시작 시 한 번만 생성)
+# ========================================
+INTENT_PROMPTS = {
+    "PLAN_TRIP": """너는 여행 계획 전문가입니다.
 **오직 여행 계획 생성만** 수행하세요. 캘린더 예약이나 공유는 하지 마세요.
 사용자가 요청하면 상세한 여행 일정을 만들어주세요.""",
 
-        "BOOK_CALENDAR": """너는 캘린더 예약 전문가입니다.
+    "BOOK_CALENDAR": """너는 캘린더 예약 전문가입니다.
 **오직 캘린더 예약 기능만** 수행하세요. 새로운 여행 계획을 생성하지 마세요.
 이전에 생성된 여행 계획을 캘린더에 등록해주세요.""",
 
-        "SHARE_PLAN": """너는 공유 전문가입니다.
+    "SHARE_PLAN": """너는 공유 전문가입니다.
 **오직 Gist 공유 기능만** 수행하세요. 여행 계획 생성이나 캘린더 예약은 하지 마세요.
 기존 여행 계획을 GitHub Gist로 저장해주세요.""",
 
-        "SEARCH_PLACE": """너는 장소 검색 전문가입니다.
+    "SEARCH_PLACE": """너는 장소 검색 전문가입니다.
 **오직 장소 검색 기능만** 수행하세요. 전체 여행 계획을 생성하지 마세요.
 사용자가 요청한 장소나 정보를 찾아서 알려주세요.""",
 
-        "MANAGE_EVENT": """너는 일정 관리 전문가입니다.
+    "MANAGE_EVENT": """너는 일정 관리 전문가입니다.
 **오직 기존 일정의 조회/수정/삭제만** 수행하세요. 새로운 계획은 생성하지 마세요.
 캘린더의 기존 일정을 관리해주세요."""
-    }
+}
 
-    system_prompt = f"""{intent_prompts.get(intent, "너는 도움이 되는 AI 어시스턴트입니다.")}
+def build_system_prompt(intent: str, tools: list) -> str:
+    """인텐트별 시스템 프롬프트 (대화 컨텍스트는 실행 시점에 주입)"""
+    return f"""{INTENT_PROMPTS.get(intent, "너는 도움이 되는 AI 어시스턴트입니다.")}
 
 **중요: 출력 형식 규칙**
 - 반드시 일반 한국어 텍스트로만 응답하세요
@@ -72,10 +71,20 @@ def create_intent_based_agent(intent: str, user_input: str):
 허용된 도구만 사용하고, 사용자가 명시적으로 요청하지 않은 추가 작업은 금지합니다.
 
 현재 대화 컨텍스트: {{conversation_context}}
-사용 가능한 도구: {[tool.name if hasattr(tool, 'name') else tool.__name__ for tool in filtered_tools]}"""
+사용 가능한 도구: {[tool.name if hasattr(tool, 'name') else tool.__name__ for tool in tools]}"""
+
+def build_intent_agent(intent: str):
+    """
+    인텐트에 따라 특정 도구만 사용하는 에이전트 생성 (캐시 없이 매번 새로 생성)
+    """
+    # langchain.agents 는 import 비용이 커서 에이전트가 처음 필요할 때 불러옵니다.
+    from langchain.agents import initialize_agent, AgentType
+    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+    filtered_tools = filter_tools_by_intent(intent, all_tools)
 
     prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
+        ("system", build_system_prompt(intent, filtered_tools)),
         MessagesPlaceholder(variable_name="chat_history"),
         ("human", "{input}"),
         MessagesPlaceholder(variable_name="agent_scratchpad"),
@@ -83,7 +92,7 @@ def create_intent_based_agent(intent: str, user_input: str):
 
     agent = initialize_agent(
         tools=filtered_tools,
-        llm=llm,
+        llm=get_llm(),
         agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
         memory=None,  # 메모리는 app.py에서 관리하므로 여기서는 None 또는 필요 시 전달
         verbose=True,
@@ -97,4 +106,29 @@ def create_intent_based_agent(intent: str, user_input: str):
         }
     )
 
-    return agent
\ No newline at end of file
+    return agent
+
+# ========================================
+# 인텐트별 에이전트 레지스트리
+# ========================================
+_registry_lock = threading.Lock()
+
+def get_intent_agent(intent: str):
+    """
+    프로세스당 인텐트별로 한 번만 에이전트를 만들고 모든 세션/턴에서 재사용합니다.
+    에이전트는 상태(memory)를 갖지 않으므로 공유해도 안전합니다.
+    (Streamlit 없이 API 서버 등에서도 같은 레지스트리를 사용)
+    """
+    with _registry_lock:
+        return _cached_intent_agent(intent)
+
+@lru_cache(maxsize=None)
+def _cached_intent_agent(intent: str):
+    return build_intent_agent(intent)
+
+def create_intent_based_agent(intent: str, user_input: str):
+    """
+    인텐트에 맞는 에이전트 반환 (캐시된 에이전트 재사용)
+    턴마다 달라지는 대화 컨텍스트와 사용자 입력은 agent.run() 입력으로 전달합니다.
+    """
+    return get_intent_agent(intent)
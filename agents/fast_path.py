@@ -0,0 +1,52 @@
+import re
+
+from tools.calendar_tools import list_events_tool
+from tools.share_tools import share_travel_plan_gist, debug_share_status
+from utils.utils import parse_korean_date, extract_date_from_input
+
+# ========================================
+# 인텐트만으로 도구가 결정되는 요청은 에이전트(LLM)를 거치지 않고 바로 실행
+# ========================================
+SHARE_DEBUG_WORDS = ("디버그", "debug", "상태 확인")
+LIST_WORDS = ("목록", "조회", "보여", "확인", "알려")
+MUTATE_WORDS = ("수정", "삭제", "변경", "바꿔", "취소", "옮겨")
+# 연도까지 있는 날짜 (parse_korean_date 가 해석하는 형식)
+FULL_DATE = re.compile(r"\d{2,4}년\s*\d{1,2}월\s*\d{1,2}일|\d{4}-\d{1,2}-\d{1,2}|\d{2}/\d{1,2}/\d{1,2}")
+# 날짜로 보이는 모든 표현 ("6월 20일", "20일", "이번 주" 등)
+DATE_HINT = re.compile(r"\d+\s*[년월일]|\d+[-/.]\d+|오늘|내일|모레|어제|이번\s*주|다음\s*주|주말")
+
+def route_fast_path(intent: str, user_input: str):
+    """
+    인텐트와 입력만으로 실행할 도구가 명확하면 도구를 직접 호출해 결과를 반환합니다.
+    애매한 경우에는 None을 반환하고, 호출 측에서 에이전트로 처리합니다.
+    """
+    text = user_input.lower()
+
+    if intent == "SHARE_PLAN":
+        # "파일명;내용;설명" 처럼 직접 내용을 지정하는 요청은 에이전트가 인자를 만들어야 함
+        if ";" in user_input:
+            return None
+        if any(word in text for word in SHARE_DEBUG_WORDS):
+            return debug_share_status.invoke("")
+        return share_travel_plan_gist.invoke("")
+
+    if intent == "MANAGE_EVENT":
+        # 수정/삭제는 이벤트 ID 등 인자 해석이 필요하므로 에이전트로 넘김
+        if any(word in text for word in MUTATE_WORDS):
+            return None
+        if any(word in text for word in LIST_WORDS):
+            if not DATE_HINT.search(user_input):
+                return list_events_tool.invoke("")
+            # "25년 6월 20일부터 25년 6월 22일까지", "내일 일정" 처럼 해석 가능한 날짜만 기간 조회로 처리
+            dates = [parse_korean_date(mention) for mention in FULL_DATE.findall(user_input)][:2]
+            if not dates:
+                date = extract_date_from_input(user_input)
+                dates = [date] if date else []
+            if not dates:
+                # "6월 20일", "이번 주" 등 연도/기준이 필요한 표현은 에이전트가 해석
+                return None
+            if len(dates) == 1:
+                dates.append(dates[0])
+            return list_events_tool.invoke(";".join(dates))
+
+    return None
@@ -1,36 +1,67 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import os
+import time
+
 import streamlit as st
-from langchain.schema import AIMessage, HumanMessage
-from langchain.memory import ConversationBufferMemory
-
-from config import (
-    SERVICE_ACCOUNT_FILE,
-    SCOPES,
-    CALENDAR_ID,
-    credentials,
-    service,
-    llm
-)
-from intents.intent_detector import detect_intent, filter_tools_by_intent
-from utils.utils import (
-    safe_add_message_to_memory,
-    sanitize_input,
-    extract_actual_response,
-    format_conversation_for_agent
-)
-from tools.search_tools import search_place
-from tools.calendar_tools import (
-    check_event_exists,
-    create_event_tool,
-    list_events_tool,
-    update_event_tool,
-    delete_event_tool
+
+from planner.core import PlannerSession, begin_turn, respond, add_assistant_message
+from tools.booking_jobs import (
+    get_booking_queue,
+    format_job_progress,
+    format_job_result,
+    SESSION_JOBS_KEY,
+    FINISHED_STATUSES,
+    DONE
 )
-from tools.travel_tools import plan_trip_tool, create_calendar_from_plan
-from tools.share_tools import share_gist_tool, share_travel_plan_gist, debug_share_status
-from agents.agent_factory import create_intent_based_agent
+from utils.conversation_context import get_prompt_metrics
+from utils.llm_cache import cache_stats as llm_cache_stats
+from utils.streaming import TokenStream, stream_to
+from utils.tracing import trace_turn, span, summarize_turn, span_percentiles
+
+TRACE_HISTORY = 20  # 사이드바에 표시할 최근 턴 수
+# 예약 작업 진행 상황을 채팅 화면에서 지켜보는 최대 시간(초), 이후에는 사이드바에서 확인
+BOOKING_UI_WAIT = float(os.getenv("BOOKING_UI_WAIT", "120"))
+# 결과를 이미 대화 기록에 추가한 예약 작업 ID 를 저장하는 세션 키
+REPORTED_JOBS_KEY = "reported_booking_jobs"
+
+def add_job_result(job: dict):
+    """끝난 예약 작업의 결과를 대화 기록에 한 번만 추가"""
+    reported = st.session_state.setdefault(REPORTED_JOBS_KEY, set())
+    if job["job_id"] in reported:
+        return None
+    reported.add(job["job_id"])
+    result_text = format_job_result(job)
+    add_assistant_message(st.session_state.planner_session, result_text)
+    return result_text
+
+def report_finished_jobs():
+    """화면을 기다리는 시간(BOOKING_UI_WAIT)이 지난 뒤 끝난 작업의 결과를 다음 재실행 때 추가"""
+    for job_id in st.session_state.get(SESSION_JOBS_KEY, []):
+        if job_id in st.session_state.get(REPORTED_JOBS_KEY, set()):
+            continue
+        job = get_booking_queue().status(job_id)
+        if job is not None and job["status"] in FINISHED_STATUSES:
+            add_job_result(job)
+
+def render_job_progress(job_id: str):
+    """예약 작업이 끝날 때까지 진행률을 갱신하고, 끝나면 결과를 대화 기록에 추가"""
+    queue = get_booking_queue()
+    job = queue.status(job_id)
+    progress = st.progress(0.0, text=format_job_progress(job))
+    deadline = time.monotonic() + BOOKING_UI_WAIT
+    while job["status"] not in FINISHED_STATUSES and time.monotonic() < deadline:
+        time.sleep(0.3)
+        job = queue.status(job_id)
+        progress.progress(job["done"] / max(job["total"], 1), text=format_job_progress(job))
+    progress.progress(job["done"] / max(job["total"], 1), text=format_job_progress(job))
+    if job["status"] in FINISHED_STATUSES:
+        result_text = add_job_result(job)
+        if result_text:
+            st.markdown(result_text)
+    else:
+        st.caption("⏳ 예약이 백그라운드에서 계속 진행됩니다. 사이드바의 '예약 작업'에서 확인하세요.")
 
 # ========================================
 # Streamlit UI 설정
@@ -63,19 +94,73 @@ with st.sidebar:
     ```
     """)
 
+    with st.expander("⚡ LLM 캐시 적중률"):
+        llm_stats = llm_cache_stats()
+        if llm_stats:
+            for tool_name, stats in llm_stats.items():
+                st.caption(
+                    f"{tool_name}: {stats['hits']}/{stats['hits'] + stats['misses']} "
+                    f"({stats['hit_rate']:.0%})"
+                )
+        else:
+            st.caption("아직 LLM 호출이 없습니다.")
+
+    with st.expander("📏 프롬프트 토큰"):
+        prompt_metrics = get_prompt_metrics()
+        if prompt_metrics:
+            last = prompt_metrics[-1]
+            average = sum(m["prompt_tokens"] for m in prompt_metrics) / len(prompt_metrics)
+            st.caption(
+                f"마지막 턴({last['intent']}): {last['prompt_tokens']} / 예산 {last['budget']} 토큰"
+            )
+            st.caption(f"요약 {last['summary_tokens']} 토큰 · 최근 대화 {last['recent_turns']}개")
+            notes = (["여행 계획 일부 생략"] if last.get("plan_truncated") else []) + (
+                [f"예산 초과 {last['overrun']} 토큰"] if last.get("overrun") else []
+            )
+            if notes:
+                st.caption(" · ".join(notes))
+            st.caption(f"평균 {average:.0f} 토큰 ({len(prompt_metrics)}턴)")
+        else:
+            st.caption("아직 전송된 프롬프트가 없습니다.")
+
+    with st.expander("📨 예약 작업"):
+        job_ids = st.session_state.get(SESSION_JOBS_KEY, [])
+        if job_ids:
+            for job_id in reversed(job_ids[-5:]):
+                job = get_booking_queue().status(job_id)
+                if job is None:
+                    continue
+                st.caption(f"{job_id} ({job['label'] or job['trip_key']}): {format_job_progress(job)}")
+                if job["status"] in FINISHED_STATUSES and job["status"] != DONE:
+                    if st.button("다시 시도", key=f"retry_{job_id}"):
+                        # 완료된 이벤트는 건너뛰고 나머지만 다시 등록 (끝나면 새 결과를 다시 표시)
+                        get_booking_queue().retry(job_id)
+                        st.session_state.get(REPORTED_JOBS_KEY, set()).discard(job_id)
+                        st.rerun()
+        else:
+            st.caption("아직 예약 작업이 없습니다.")
+
+    with st.expander("🧭 트레이스"):
+        traces = st.session_state.get("traces", [])
+        if traces:
+            last_turn = traces[-1]
+            st.caption(f"마지막 턴({last_turn['attrs'].get('intent')}): {last_turn['duration_ms']:.0f}ms")
+            for kind, total_ms in sorted(summarize_turn(last_turn).items(), key=lambda item: -item[1]):
+                st.caption(f"· {kind}: {total_ms:.0f}ms")
+            st.caption(f"최근 {len(traces)}턴 p50 / p95")
+            for kind, stats in sorted(span_percentiles(traces).items()):
+                st.caption(f"· {kind}: {stats['p50']:.0f} / {stats['p95']:.0f}ms ({stats['count']}회)")
+        else:
+            st.caption("아직 기록된 트레이스가 없습니다.")
+
 # ========================================
-# 1) 초기 메시지 및 메모리 설정
+# 1) 세션 설정
 # ========================================
-memory = ConversationBufferMemory(
-    memory_key="chat_history",
-    return_messages=True
-)
-
-if "messages" not in st.session_state:
-    st.session_state.messages = []
-    welcome_text = "안녕하세요! AI 여행 플래너입니다."
-    st.session_state.messages.append({"role": "assistant", "content": welcome_text})
-    safe_add_message_to_memory(memory, AIMessage(content=welcome_text))
+# 대화 기록/메모리는 st.session_state 에 두고, 처리 로직은 화면과 무관한 planner.core 가 담당
+if "planner_session" not in st.session_state:
+    st.session_state.planner_session = PlannerSession(st.session_state)
+planner_session = st.session_state.planner_session
+report_finished_jobs()
 
 # ========================================
 # 2) 채팅 기록 표시
@@ -91,38 +176,44 @@ with col1:
 # ========================================
 user_input = st.chat_input("메시지를 입력하고 Enter를 눌러주세요...")
 if user_input:
-    sanitized = sanitize_input(user_input)
-
-    # 3-1) 인텐트 감지
-    detected_intent = detect_intent(user_input)
-    st.info(f"🎯 감지된 인텐트: {detected_intent}")
-
-    # 3-2) 메시지 저장
-    st.session_state.messages.append({"role": "user", "content": user_input})
-    safe_add_message_to_memory(memory, HumanMessage(content=user_input))
-    with st.chat_message("user"):
-        st.markdown(user_input)
-
-    # 3-3) 인텐트 기반 에이전트 실행
-    with st.chat_message("assistant"):
-        with st.spinner(f"인텐트({detected_intent}) 처리 중..."):
-            try:
-                agent = create_intent_based_agent(detected_intent, user_input)
-                conversation_context = format_conversation_for_agent()
-                enhanced_prompt = f"{conversation_context}\n\n현재 요청: {sanitized}"
-
-                raw_response = agent.run(enhanced_prompt)
-                cleaned_response = extract_actual_response(raw_response)
-                response = cleaned_response
-
-            except Exception as e:
-                error_message = str(e)
-                if "Could not parse LLM output:" in error_message:
-                    response = extract_actual_response(error_message)
-                else:
-                    response = f"⚠️ 시스템 오류: {error_message}"
-                    st.error("문제가 발생했어요. 다시 시도해주세요.")
-
-            st.markdown(response)
-            st.session_state.messages.append({"role": "assistant", "content": response})
-            safe_add_message_to_memory(memory, AIMessage(content=response))
\ No newline at end of file
+    with trace_turn() as turn:
+        # 3-1) 인텐트 감지 및 메시지 저장
+        intent_match = begin_turn(planner_session, user_input)
+        detected_intent = intent_match.intent
+        turn["attrs"]["intent"] = detected_intent
+        if intent_match.scores:
+            st.write(f"🔍 인텐트 점수: {intent_match.scores} → 선택: {detected_intent}")
+        st.info(f"🎯 감지된 인텐트: {detected_intent}")
+
+        with st.chat_message("user"):
+            st.markdown(user_input)
+
+        # 3-2) 인텐트 기반 응답 생성
+        with st.chat_message("assistant"):
+            # 여행 계획 생성 시 토큰을 이 자리에 실시간으로 표시
+            stream_placeholder = st.empty()
+            token_stream = TokenStream(stream_placeholder)
+            jobs_before = len(st.session_state.get(SESSION_JOBS_KEY, []))
+            with st.spinner(f"인텐트({detected_intent}) 처리 중..."), stream_to(token_stream):
+                result = respond(planner_session, user_input, detected_intent)
+            if result.error:
+                st.error("문제가 발생했어요. 다시 시도해주세요.")
+
+            with span("ui_render", "response", chars=len(result.response)):
+                stream_placeholder.markdown(result.response)
+            # 이번 턴에 제출된 예약 작업의 진행 상황을 응답 아래에 표시
+            for job_id in st.session_state.get(SESSION_JOBS_KEY, [])[jobs_before:]:
+                render_job_progress(job_id)
+            turn_metrics = token_stream.metrics
+            if turn_metrics:
+                st.caption(
+                    f"⏱️ 첫 토큰 {turn_metrics['ttft']:.2f}초 · 생성 {turn_metrics['total']:.2f}초"
+                )
+                st.session_state.setdefault("turn_metrics", []).append(
+                    {"intent": detected_intent, **turn_metrics}
+                )
+
+    # 턴이 끝난 뒤(소요 시간 확정 후) 최근 N턴만 세션에 보관
+    traces = st.session_state.setdefault("traces", [])
+    traces.append(turn)
+    del traces[:-TRACE_HISTORY]
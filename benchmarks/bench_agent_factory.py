@@ -0,0 +1,53 @@
+"""
+에이전트 생성 오버헤드 마이크로벤치마크
+
+    python -m benchmarks.bench_agent_factory [반복 횟수]
+
+매 턴마다 에이전트를 새로 만드는 방식(build_intent_agent)과
+인텐트별 레지스트리에서 재사용하는 방식(create_intent_based_agent)의 턴당 비용을 비교합니다.
+외부 API를 호출하지 않도록 LLM을 로컬 대체 객체로 바꿔서 실행합니다.
+"""
+import sys
+import time
+import statistics
+
+INTENTS = ["PLAN_TRIP", "BOOK_CALENDAR", "SHARE_PLAN", "SEARCH_PLACE", "MANAGE_EVENT", "OTHER"]
+
+def _install_offline_config():
+    """Bedrock 자격 증명 없이 실행되도록 LLM만 로컬 대체 객체로 교체"""
+    from langchain_community.llms.fake import FakeListLLM
+
+    import config
+    fake_llm = FakeListLLM(responses=["Final Answer: ok"])
+    config.get_llm = lambda: fake_llm
+
+def _measure(fn, rounds: int) -> list:
+    samples = []
+    for _ in range(rounds):
+        for intent in INTENTS:
+            start = time.perf_counter()
+            fn(intent)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def main(rounds: int = 50):
+    _install_offline_config()
+    from agents.agent_factory import build_intent_agent, create_intent_based_agent
+
+    # 레지스트리 예열 (인텐트당 최초 1회 생성)
+    for intent in INTENTS:
+        create_intent_based_agent(intent, "")
+
+    rebuilt = _measure(build_intent_agent, rounds)
+    cached = _measure(lambda intent: create_intent_based_agent(intent, ""), rounds)
+
+    print(f"턴 수: {len(rebuilt)} (인텐트 {len(INTENTS)}개 x {rounds}회)")
+    for label, samples in (("매 턴 새로 생성", rebuilt), ("레지스트리 재사용", cached)):
+        print(
+            f"{label:<12} 평균 {statistics.mean(samples):8.3f} ms | "
+            f"p50 {statistics.median(samples):8.3f} ms | 최대 {max(samples):8.3f} ms"
+        )
+    print(f"턴당 절감: {statistics.mean(rebuilt) - statistics.mean(cached):.3f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,191 @@
+"""
+오프라인 종단 간(end-to-end) 벤치마크
+
+    python -m benchmarks.bench_e2e [--rounds 5] [--llm-latency 0.2] [--api-latency 0.05]
+
+Bedrock / Google Calendar / Serper / GitHub 를 benchmarks/fakes.py 의 로컬 대체 객체로 바꾼 뒤
+app.py 와 같은 planner.core 경로(인텐트 감지 → 빠른 경로 → 에이전트)로 인텐트별 대표 요청을 실행하고
+턴별 지연 시간, LLM/캘린더/HTTP 호출 수, 메모리 할당량을 보고합니다.
+성능 작업 전후의 회귀 기준선으로 사용합니다.
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import logging
+import tempfile
+import statistics
+import tracemalloc
+from collections import Counter
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+
+# 실제 서비스 대신 로컬 대체 객체를 쓰도록 프로젝트 모듈을 import 하기 전에 환경 변수 설정
+_WORK_DIR = tempfile.mkdtemp(prefix="travel_planner_bench_")
+os.environ["TRAVEL_PLANNER_CACHE_DIR"] = _WORK_DIR
+os.environ["TRACE_FILE"] = os.path.join(_WORK_DIR, "traces.jsonl")
+os.environ["CALENDAR_ID"] = "bench@example.com"
+os.environ["SERPER_API_KEY"] = "bench"
+os.environ["GITHUB_TOKEN"] = "bench"
+
+# 예약한 일정이 "예정된 일정" 조회에 나오도록 한 달 뒤로 여행 날짜를 잡음
+TRIP_START = date.today() + timedelta(days=30)
+BOOK_INPUT = f"{TRIP_START.year % 100}년 {TRIP_START.month}월 {TRIP_START.day}일 시작"
+
+# (인텐트, 사용자 입력) - 한 라운드는 새 세션에서 아래 순서대로 진행
+SCENARIOS = [
+    ("PLAN_TRIP", "부산 2박 3일 여행 계획 짜줘"),
+    ("BOOK_CALENDAR", f"{BOOK_INPUT}으로 캘린더 예약해줘"),
+    ("SHARE_PLAN", "여행 계획 공유해줘"),
+    ("SEARCH_PLACE", "해운대 맛집 검색해줘"),
+    ("MANAGE_EVENT", "내 일정 목록 보여줘"),
+]
+
+PLAN_TEXT = f"""Day1 ({TRIP_START}):
+ - 09:00~10:00 : 부산역 도착 및 호텔 체크인
+ - 11:00~12:30 : 해운대 해수욕장 산책
+ - 13:00~14:00 : 점심 (해운대 돼지국밥)
+ - 15:00~17:00 : 동백섬 누리마루 관람
+
+Day2 ({TRIP_START + timedelta(days=1)}):
+ - 09:00~11:00 : 감천문화마을
+ - 12:00~13:00 : 점심 (자갈치시장 회)
+ - 14:00~16:00 : 태종대 유원지
+ - 19:00~21:00 : 광안리 야경
+
+Day3 ({TRIP_START + timedelta(days=2)}):
+ - 09:00~10:30 : 해동용궁사
+ - 11:00~12:00 : 기장 시장
+ - 13:00~14:00 : 부산역 출발"""
+
+# 프롬프트 패턴 → 대체 모델 응답 (위에서부터 먼저 일치한 것 사용)
+LLM_SCRIPT = [
+    (r"^\s*여행 계획 요청:", PLAN_TEXT),
+    (r"이전 요약:", "부산 2박 3일 여행 계획을 만들고 캘린더 예약과 공유를 마쳤습니다."),
+    (r"현재 요청: .*예약", "Thought: 기존 계획을 캘린더에 등록합니다.\n"
+                          f"Action: create_calendar_from_plan\nAction Input: {BOOK_INPUT}"),
+    (r"현재 요청: .*(맛집|검색|찾아)", "Thought: 장소를 검색합니다.\n"
+                                  "Action: search_places_batch\nAction Input: 해운대 맛집; 광안리 카페"),
+    (r"현재 요청: .*(계획|짜줘)", "Thought: 여행 계획을 만듭니다.\n"
+                               "Action: plan_trip_tool\nAction Input: 부산 2박 3일"),
+]
+
+def install_fakes(llm_latency: float, token_latency: float, api_latency: float):
+    """설정 모듈의 LLM/캘린더 생성 함수를 대체 객체로 바꾸고 로컬 API 서버를 띄움"""
+    from benchmarks.fakes import ScriptedChatModel, FakeCalendarService, FakeApiServer
+
+    server = FakeApiServer(latency=api_latency).start()
+    os.environ["SERPER_SEARCH_URL"] = f"{server.url}/search"
+    os.environ["GITHUB_API_URL"] = server.url
+
+    import config
+    llm = ScriptedChatModel(script=LLM_SCRIPT, latency=llm_latency, token_latency=token_latency)
+    calendar = FakeCalendarService(latency=api_latency)
+    config._build_llm = lambda: llm
+    config._build_calendar_service = lambda: calendar
+    # Calendar HTTP 풀이 서비스 계정 키 파일 없이 전송 객체를 만들 수 있도록 익명 자격 증명 사용
+    from google.auth.credentials import AnonymousCredentials
+    anonymous = AnonymousCredentials()
+    config.get_credentials = lambda: anonymous
+    return llm, calendar, server
+
+def _call_count(counter: Counter) -> int:
+    """대체 객체의 호출 수 합계 (배치 묶음과 할당량 초과 표시는 요청 수에서 제외)"""
+    return sum(count for name, count in counter.items() if name not in ("batch", "rate_limited"))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 종단 간 벤치마크")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="LLM 호출당 지연 (초)")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="스트리밍 토큰 간 지연 (초)")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="Calendar/Serper/GitHub 호출당 지연 (초)")
+    parser.add_argument("--verbose", action="store_true", help="에이전트 실행 로그와 턴별 응답 앞부분 출력")
+    args = parser.parse_args(argv)
+
+    # Streamlit 런타임 밖에서 실행할 때 나오는 경고 숨김
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    llm, calendar, server = install_fakes(args.llm_latency, args.token_latency, args.api_latency)
+    from planner.core import PlannerSession, run_turn
+    from tools.booking_jobs import get_booking_queue, SESSION_JOBS_KEY
+    from tools.booking_prefetch import SESSION_PREFETCH_KEY
+
+    results = {intent: [] for intent, _ in SCENARIOS}
+    mismatches = []
+    job_ms = []
+    tracemalloc.start()
+    try:
+        for round_index in range(args.rounds):
+            session = PlannerSession()
+            for expected, user_input in SCENARIOS:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                started = time.perf_counter()
+                # 에이전트의 verbose 출력은 --verbose 일 때만 표시
+                jobs_before = len(session.state.get(SESSION_JOBS_KEY, []))
+                # 백그라운드 작업의 호출도 요청한 턴에 포함되도록 대체 객체의 호출 수로 집계
+                calls_before = (_call_count(llm.calls), _call_count(calendar.calls), _call_count(server.calls))
+                with redirect_stdout(sys.stdout if args.verbose else io.StringIO()):
+                    result = run_turn(session, user_input)
+                elapsed = (time.perf_counter() - started) * 1000
+                # 예약은 백그라운드 작업이므로 다음 턴(일정 조회) 전에 완료를 기다리고 소요 시간을 따로 기록
+                for job_id in session.state.get(SESSION_JOBS_KEY, [])[jobs_before:]:
+                    job_started = time.perf_counter()
+                    job = get_booking_queue().wait(job_id, timeout=60, interval=0.01)
+                    job_ms.append((time.perf_counter() - job_started) * 1000)
+                    if job["status"] != "done":
+                        mismatches.append((user_input, "booking job", job["status"]))
+                # 계획 턴 뒤의 예약 사전 준비(캘린더 조회)도 끝난 뒤에 집계
+                prefetch = session.state.get(SESSION_PREFETCH_KEY)
+                if prefetch is not None:
+                    prefetch["future"].result(timeout=60)
+                after, peak = tracemalloc.get_traced_memory()
+
+                if result.intent != expected:
+                    mismatches.append((user_input, expected, result.intent))
+                llm_calls, calendar_calls, http_calls = (
+                    _call_count(counter) - count
+                    for counter, count in zip((llm.calls, calendar.calls, server.calls), calls_before)
+                )
+                results[expected].append({
+                    "ms": elapsed,
+                    "llm": llm_calls,
+                    "calendar": calendar_calls,
+                    "http": http_calls,
+                    "fast_path": result.fast_path,
+                    "alloc_kb": (after - before) / 1024,
+                    "peak_kb": (peak - before) / 1024,
+                })
+                if args.verbose:
+                    print(f"[{round_index + 1}] {expected}: {result.response[:60]!r}")
+    finally:
+        tracemalloc.stop()
+        server.stop()
+
+    print(f"라운드: {args.rounds} | LLM 지연 {args.llm_latency}s | API 지연 {args.api_latency}s")
+    print(f"{'인텐트':<14}{'첫 턴 ms':>10}{'이후 p50':>10}{'이후 최대':>10}"
+          f"{'LLM':>6}{'캘린더':>6}{'HTTP':>6}{'할당 KB':>10}{'최대 KB':>10}")
+    for intent, samples in results.items():
+        first, rest = samples[0], samples[1:] or samples[:1]
+        rest_ms = [sample["ms"] for sample in rest]
+        print(
+            f"{intent:<16}{first['ms']:>10.1f}{statistics.median(rest_ms):>10.1f}{max(rest_ms):>10.1f}"
+            f"{statistics.mean(s['llm'] for s in samples):>6.1f}"
+            f"{statistics.mean(s['calendar'] for s in samples):>8.1f}"
+            f"{statistics.mean(s['http'] for s in samples):>7.1f}"
+            f"{statistics.mean(s['alloc_kb'] for s in samples):>11.1f}"
+            f"{statistics.mean(s['peak_kb'] for s in samples):>10.1f}"
+            + ("  (빠른 경로)" if all(s["fast_path"] for s in samples) else "")
+        )
+    if job_ms:
+        print(f"백그라운드 예약 작업: {len(job_ms)}건, 턴 이후 완료까지 평균 {statistics.mean(job_ms):.1f} ms")
+    print(f"대체 LLM 응답: {dict(llm.calls)}")
+    print(f"대체 캘린더 호출: {dict(calendar.calls)}")
+    print(f"대체 API 서버 호출: {dict(server.calls)}")
+    if mismatches:
+        print(f"⚠️ 인텐트 불일치: {mismatches}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+인텐트 감지 벤치마크
+
+    python -m benchmarks.bench_intent_detector [발화 수]
+
+기존 방식(인텐트별 키워드마다 substring 검사)과 Aho-Corasick 매처의 처리 시간을 비교합니다.
+1) 현재 INTENT_KEYWORDS 로 두 방식의 결과가 같은지 확인하고
+2) 키워드 표를 수백 개로 늘렸을 때 발화당 비용이 어떻게 변하는지 측정합니다.
+"""
+import sys
+import time
+import random
+
+import intents.intent_detector as intent_detector
+from intents.keyword_matcher import KeywordMatcher
+
+TEMPLATES = [
+    "{place} {days} 여행 계획 짜줘",
+    "{place} 맛집 검색해줘",
+    "{place} 관광지 알려줘",
+    "25년 6월 {day}일 시작으로 캘린더 예약해줘",
+    "여행 계획 공유해줘",
+    "gist 만들어줘",
+    "일정 목록 보여줘",
+    "내일 일정 삭제해줘",
+    "{place} 코스 추천 부탁해",
+    "안녕하세요 반가워요",
+]
+PLACES = ["부산", "해운대", "제주", "강릉", "경주", "서울", "전주", "여수", "속초", "광안리"]
+DAYS = ["1박 2일", "2박 3일", "3박 4일"]
+
+def build_corpus(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(
+            place=rng.choice(PLACES), days=rng.choice(DAYS), day=rng.randint(1, 28)
+        )
+        for _ in range(size)
+    ]
+
+def legacy_detect(user_input: str, intent_keywords: dict) -> str:
+    """기존 detect_intent 구현 (키워드마다 substring 검사)"""
+    user_input_lower = user_input.lower()
+    intent_scores = {}
+    for intent, keyword_groups in intent_keywords.items():
+        score = 0
+        for keyword in keyword_groups["primary"]:
+            if keyword in user_input_lower:
+                score += 3
+        for keyword in keyword_groups["secondary"]:
+            if keyword in user_input_lower:
+                score += 1
+        if score > 0:
+            intent_scores[intent] = score
+    if "공유" in user_input_lower:
+        intent_scores["SHARE_PLAN"] = intent_scores.get("SHARE_PLAN", 0) + 5
+    if not intent_scores:
+        return "OTHER"
+    return max(intent_scores, key=intent_scores.get)
+
+def expanded_keywords(extra_per_intent: int) -> dict:
+    """인텐트마다 secondary 키워드를 extra_per_intent 개씩 추가한 키워드 표"""
+    expanded = {}
+    for intent, groups in intent_detector.INTENT_KEYWORDS.items():
+        extra = [f"{intent.lower()}_키워드{i}" for i in range(extra_per_intent)]
+        expanded[intent] = {"primary": list(groups["primary"]), "secondary": groups["secondary"] + extra}
+    return expanded
+
+def use_keywords(intent_keywords: dict):
+    """intent_detector 의 매처를 주어진 키워드 표로 다시 빌드"""
+    intent_detector.INTENT_KEYWORDS = intent_keywords
+    intent_detector._RULES = intent_detector._build_rules()
+    intent_detector._MATCHER = KeywordMatcher(intent_detector._RULES.keys())
+
+def timed(fn, corpus: list) -> float:
+    start = time.perf_counter()
+    for utterance in corpus:
+        fn(utterance)
+    return (time.perf_counter() - start) / len(corpus) * 1e6
+
+def main(size: int = 3000):
+    corpus = build_corpus(size)
+    original = intent_detector.INTENT_KEYWORDS
+
+    mismatches = [
+        text for text in corpus
+        if legacy_detect(text, original) != intent_detector.detect_intent(text)
+    ]
+    print(f"발화 {len(corpus)}개, 결과 불일치: {len(mismatches)}개")
+
+    print(f"{'키워드 수':>8} | {'기존(µs/발화)':>14} | {'매처(µs/발화)':>14}")
+    for extra in (0, 20, 60, 100):
+        keywords = expanded_keywords(extra)
+        use_keywords(keywords)
+        total = sum(len(g["primary"]) + len(g["secondary"]) for g in keywords.values())
+        legacy = timed(lambda text: legacy_detect(text, keywords), corpus)
+        matcher = timed(intent_detector.detect_intent, corpus)
+        print(f"{total:>8} | {legacy:>14.2f} | {matcher:>14.2f}")
+
+    use_keywords(original)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -0,0 +1,383 @@
+"""
+오프라인 벤치마크용 로컬 대체 객체
+
+- ScriptedChatModel   : 프롬프트 패턴에 따라 정해진 응답을 돌려주는 Bedrock 대체 채팅 모델
+- FakeCalendarService : 메모리에 이벤트를 저장하는 Google Calendar `service` 대체 객체
+- FakeApiServer       : google.serper.dev / api.github.com 을 흉내 내는 로컬 HTTP 서버
+
+모두 호출 지연(latency)을 설정할 수 있고 호출 횟수를 기록합니다.
+"""
+import re
+import json
+import time
+import threading
+import itertools
+from collections import Counter, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any
+
+from googleapiclient.errors import HttpError
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
+
+# ========================================
+# 1) Bedrock 대체 채팅 모델
+# ========================================
+def _agent_observation(text: str):
+    """ReAct 에이전트 프롬프트의 작업 기록(scratchpad)에 있는 마지막 도구 결과 (없으면 None)"""
+    scratchpad = text.rsplit("\nQuestion:", 1)[-1]
+    if "\nObservation:" not in scratchpad:
+        return None
+    return scratchpad.rsplit("\nObservation:", 1)[1].split("\nThought:", 1)[0].strip()
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    프롬프트(메시지 전체 텍스트)를 script 의 정규식과 순서대로 비교해 처음 일치한 응답을 반환합니다.
+    응답은 문자열 또는 프롬프트를 받아 문자열을 만드는 함수입니다.
+    에이전트 프롬프트에 도구 결과(Observation)가 있으면 그 결과를 최종 답변으로 돌려줍니다.
+    """
+    script: list = []
+    default: str = "Final Answer: 요청을 처리했습니다."
+    latency: float = 0.0  # 호출당 첫 토큰까지의 지연 (초)
+    token_latency: float = 0.0  # 스트리밍 시 토큰 간 지연 (초)
+    calls: Any = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = Counter()
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-chat"
+
+    def _respond(self, messages) -> str:
+        text = "\n".join(str(message.content) for message in messages)
+        observation = _agent_observation(text)
+        if observation is not None:
+            # 도구 결과를 그대로 최종 답변으로 사용
+            self.calls["agent_final"] += 1
+            return f"Thought: 도구 결과를 전달합니다.\nFinal Answer: {observation}"
+        for pattern, response in self.script:
+            if re.search(pattern, text):
+                self.calls[pattern] += 1
+                return response(text) if callable(response) else response
+        self.calls["default"] += 1
+        return self.default
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        message = AIMessage(content=self._respond(messages))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        for token in re.findall(r"\s*\S+", self._respond(messages)):
+            time.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+# ========================================
+# 2) Google Calendar 대체 서비스
+# ========================================
+class _Response(dict):
+    """HttpError 가 요구하는 httplib2 응답 객체 흉내"""
+
+    def __init__(self, status: int):
+        super().__init__(status=str(status))
+        self.status = status
+        self.reason = "fake"
+
+def _http_error(status: int, message: str, reason: str = None) -> HttpError:
+    error = {"message": message}
+    if reason:
+        error["errors"] = [{"reason": reason, "message": message}]
+    return HttpError(_Response(status), json.dumps({"error": error}).encode())
+
+class _Request:
+    def __init__(self, service, operation: str, fn):
+        self.service = service
+        self.operation = operation
+        self.fn = fn
+
+    def execute(self, http=None, num_retries: int = 0):
+        self.service.calls[self.operation] += 1
+        time.sleep(self.service.latency)
+        self.service.charge()
+        with self.service.lock:
+            return self.fn()
+
+class _Batch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request_id or str(len(self.requests)), request, callback))
+
+    def execute(self, http=None):
+        self.service.calls["batch"] += 1
+        time.sleep(self.service.latency)
+        for request_id, request, callback in self.requests:
+            self.service.calls[request.operation] += 1
+            try:
+                self.service.charge()
+                with self.service.lock:
+                    response, error = request.fn(), None
+            except HttpError as e:
+                response, error = None, e
+            (callback or self.callback)(request_id, response, error)
+
+def _start_of(event: dict) -> str:
+    start = event.get("start", {})
+    return start.get("dateTime") or start.get("date") or ""
+
+def _end_of(event: dict) -> str:
+    end = event.get("end", {})
+    return end.get("dateTime") or end.get("date") or ""
+
+def _project(event: dict, fields: str = None) -> dict:
+    """fields="nextPageToken,items(id,summary)" 처럼 지정한 이벤트 필드만 남김"""
+    match = re.search(r"items\(([^)]*)\)", fields or "")
+    if not match:
+        return {k: v for k, v in event.items() if k != "_seq"}
+    keys = {name.strip().split("/")[0] for name in match.group(1).split(",")}
+    return {k: v for k, v in event.items() if k in keys}
+
+class _Events:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, calendarId=None, pageToken=None, maxResults=250, syncToken=None, showDeleted=False,
+             timeMin=None, timeMax=None, privateExtendedProperty=None, q=None, fields=None,
+             singleEvents=None, orderBy=None, **kwargs):
+        service = self.service
+
+        def run():
+            items = sorted(service.store.values(), key=lambda event: event["_seq"])
+            if syncToken:
+                if syncToken not in service.sync_tokens:
+                    raise _http_error(410, "Sync token is no longer valid")
+                items = [event for event in items if event["_seq"] > service.sync_tokens[syncToken]]
+            elif not showDeleted:
+                items = [event for event in items if event.get("status") != "cancelled"]
+            if timeMin:
+                items = [event for event in items if _end_of(event) > timeMin]
+            if timeMax:
+                items = [event for event in items if _start_of(event) < timeMax]
+            if privateExtendedProperty:
+                key, value = privateExtendedProperty.split("=", 1)
+                items = [
+                    event for event in items
+                    if event.get("extendedProperties", {}).get("private", {}).get(key) == value
+                ]
+            if q:
+                items = [event for event in items if q.lower() in json.dumps(event, ensure_ascii=False).lower()]
+            if orderBy == "startTime":
+                items.sort(key=_start_of)
+
+            offset = int(pageToken or 0)
+            page = items[offset:offset + maxResults]
+            result = {"items": [_project(event, fields) for event in page]}
+            if offset + maxResults < len(items):
+                result["nextPageToken"] = str(offset + maxResults)
+            elif not orderBy:
+                token = f"sync{next(service.token_ids)}"
+                service.sync_tokens[token] = service.seq
+                result["nextSyncToken"] = token
+            return result
+        return _Request(service, "events.list", run)
+
+    def get(self, calendarId=None, eventId=None, **kwargs):
+        def run():
+            event = self.service.store.get(eventId)
+            if event is None:
+                raise _http_error(404, "Not Found")
+            return self.service.public(event)
+        return _Request(self.service, "events.get", run)
+
+    def insert(self, calendarId=None, body=None, **kwargs):
+        def run():
+            event_id = body.get("id") or f"fake{next(self.service.ids)}"
+            existing = self.service.store.get(event_id)
+            if existing is not None and existing.get("status") != "cancelled":
+                raise _http_error(409, "The requested identifier already exists.")
+            return self.service.save(dict(body, id=event_id, status="confirmed"))
+        return _Request(self.service, "events.insert", run)
+
+    def update(self, calendarId=None, eventId=None, body=None, **kwargs):
+        def run():
+            if eventId not in self.service.store:
+                raise _http_error(404, "Not Found")
+            return self.service.save(dict(body, id=eventId, status=body.get("status", "confirmed")))
+        return _Request(self.service, "events.update", run)
+
+    def patch(self, calendarId=None, eventId=None, body=None, **kwargs):
+        def run():
+            event = self.service.store.get(eventId)
+            if event is None:
+                raise _http_error(404, "Not Found")
+            return self.service.save(dict(event, **body))
+        return _Request(self.service, "events.patch", run)
+
+    def delete(self, calendarId=None, eventId=None, **kwargs):
+        def run():
+            event = self.service.store.get(eventId)
+            if event is None or event.get("status") == "cancelled":
+                raise _http_error(410 if event else 404, "Resource has been deleted")
+            self.service.save(dict(event, status="cancelled"))
+            return ""
+        return _Request(self.service, "events.delete", run)
+
+class FakeCalendarService:
+    """googleapiclient 의 calendar v3 service 중 이 프로젝트가 쓰는 부분만 구현"""
+
+    def __init__(self, latency: float = 0.0, quota_per_second: float = None):
+        self.latency = latency
+        # 지정하면 최근 1초 동안 이 수를 넘는 요청은 403 rateLimitExceeded 로 거절
+        self.quota_per_second = quota_per_second
+        self.recent = deque()
+        self.store = {}
+        self.seq = 0
+        self.ids = itertools.count(1)
+        self.token_ids = itertools.count(1)
+        self.sync_tokens = {}
+        self.calls = Counter()
+        self.lock = threading.RLock()
+
+    def save(self, event: dict) -> dict:
+        self.seq += 1
+        event["_seq"] = self.seq
+        self.store[event["id"]] = event
+        return self.public(event)
+
+    def charge(self):
+        if self.quota_per_second is None:
+            return
+        with self.lock:
+            now = time.monotonic()
+            while self.recent and now - self.recent[0] >= 1.0:
+                self.recent.popleft()
+            if len(self.recent) >= self.quota_per_second:
+                self.calls["rate_limited"] += 1
+                raise _http_error(403, "Rate Limit Exceeded", reason="rateLimitExceeded")
+            self.recent.append(now)
+
+    @staticmethod
+    def public(event: dict) -> dict:
+        return {k: v for k, v in event.items() if k != "_seq"}
+
+    def events(self):
+        return _Events(self)
+
+    def new_batch_http_request(self, callback=None):
+        return _Batch(self, callback)
+
+# ========================================
+# 3) Serper / GitHub 대체 HTTP 서버
+# ========================================
+class _ApiHandler(BaseHTTPRequestHandler):
+    server_version = "FakeApi/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _reply(self, status: int, payload: dict):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method: str):
+        fake = self.server.fake
+        path = self.path.split("?", 1)[0]
+        route = re.sub(r"/gists/[^/]+$", "/gists/{id}", path)
+        fake.calls[f"{method} {route}"] += 1
+        time.sleep(fake.latency)
+        body = self._body() if method in ("POST", "PATCH") else {}
+
+        if method == "POST" and path == "/search":
+            query = body.get("q", "")
+            self._reply(200, {"organic": [
+                {
+                    "title": f"{query} 추천 {rank}",
+                    "snippet": f"{query} 관련 장소 {rank}",
+                    "link": f"https://example.com/{rank}?q={query}",
+                }
+                for rank in range(1, 6)
+            ]})
+        elif method == "POST" and path == "/gists":
+            gist_id = f"gist{next(fake.ids)}"
+            fake.gists[gist_id] = body
+            self._reply(201, fake.gist_payload(gist_id))
+        elif route == "/gists/{id}" and path.rsplit("/", 1)[1] in fake.gists:
+            gist_id = path.rsplit("/", 1)[1]
+            if method == "PATCH":
+                files = fake.gists[gist_id].setdefault("files", {})
+                files.update(body.get("files", {}))
+                if "description" in body:
+                    fake.gists[gist_id]["description"] = body["description"]
+            self._reply(200, fake.gist_payload(gist_id))
+        else:
+            self._reply(404, {"message": "Not Found"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+class FakeApiServer:
+    """
+    google.serper.dev 의 /search 와 api.github.com 의 /gists 를 흉내 내는 로컬 서버
+        with FakeApiServer(latency=0.05) as server:
+            os.environ["SERPER_SEARCH_URL"] = f"{server.url}/search"
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = Counter()
+        self.gists = {}
+        self.ids = itertools.count(1)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _ApiHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def gist_payload(self, gist_id: str) -> dict:
+        return {
+            "id": gist_id,
+            "html_url": f"https://gist.github.com/fake/{gist_id}",
+            "files": self.gists[gist_id].get("files", {}),
+        }
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,71 @@
+"""
+콜드 스타트 import 시간 프로파일
+
+    python -m benchmarks.profile_import [상위 개수]
+
+새 파이썬 프로세스에서 `python -X importtime` 으로 앱 모듈들을 import 하고,
+누적 import 시간과 가장 오래 걸린 모듈을 출력합니다.
+이어서 첫 사용 시점으로 미룬 모듈(googleapiclient, BedrockChat, langchain.agents 등)의
+import 비용을 따로 측정해, 앱 시작 시 더 이상 지불하지 않는 시간을 보여줍니다.
+"""
+import sys
+import subprocess
+
+APP_MODULES = [
+    "config",
+    "intents.intent_detector",
+    "tools.search_tools",
+    "tools.calendar_tools",
+    "tools.travel_tools",
+    "tools.share_tools",
+    "agents.agent_factory",
+    "agents.fast_path",
+]
+
+# 이전에는 config / agent_factory import 시점에 바로 불러오던 모듈들
+DEFERRED_MODULES = [
+    "googleapiclient.discovery",
+    "google.oauth2.service_account",
+    "langchain_community.chat_models.bedrock",
+    "langchain.agents",
+    "langchain.tools",
+]
+
+def importtime(statement: str) -> list:
+    """(self µs, 누적 µs, 모듈명) 목록"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # 들여쓰기는 import 깊이를 나타내므로 모듈명 앞 공백은 유지 (구분용 공백 1칸만 제거)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()[1:]))
+    return rows
+
+def total_ms(rows: list) -> float:
+    """최상위(들여쓰기 없는) 모듈의 누적 시간 합계"""
+    return sum(cumulative for _, cumulative, name in rows if not name.startswith(" ")) / 1000
+
+def main(top: int = 15):
+    app_rows = importtime("import " + ", ".join(APP_MODULES))
+    print(f"앱 모듈 import 합계: {total_ms(app_rows):.1f} ms")
+    print(f"가장 오래 걸린 모듈 (누적 기준 상위 {top}개):")
+    for _, cumulative, name in sorted(app_rows, key=lambda row: row[1], reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name.strip()}")
+
+    deferred = [m for m in DEFERRED_MODULES if m in {name.strip() for _, _, name in app_rows}]
+    if deferred:
+        print(f"⚠️ 시작 시점에 여전히 import 되는 지연 대상 모듈: {', '.join(deferred)}")
+
+    # 지연된 모듈만 따로 import 했을 때의 비용 (앱 모듈을 먼저 불러온 뒤 추가로 드는 시간)
+    extra_rows = importtime(
+        "import " + ", ".join(APP_MODULES) + "; import " + ", ".join(DEFERRED_MODULES)
+    )
+    print(f"첫 사용 시점으로 미룬 import 비용: {total_ms(extra_rows) - total_ms(app_rows):.1f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
@@ -1,10 +1,6 @@
 import os
-from datetime import datetime, timezone, timedelta
-
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
-
-from langchain_community.chat_models import BedrockChat
+import threading
+from functools import lru_cache
 
 # ========================================
 # 1) 환경 변수 로드
@@ -13,23 +9,86 @@ SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "calendar_key
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 CALENDAR_ID = os.getenv("CALENDAR_ID", "")
 
-if not CALENDAR_ID:
-    raise RuntimeError("환경 변수 CALENDAR_ID가 설정되지 않았습니다.")
+# (Anthropic Claude 3.5 Sonnet 예시, 필요 시 모델 ID 변경)
+BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "anthropic.claude-3-5-sonnet-20241022-v2:0")
+BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-west-2")
+
+# 클라이언트는 import 시점이 아니라 처음 필요할 때 한 번만 만들고 프로세스 전체에서 재사용합니다.
+# (googleapiclient / langchain_community 같은 무거운 모듈도 그때 import)
+_init_lock = threading.Lock()
+
+def require_calendar_id() -> str:
+    if not CALENDAR_ID:
+        raise RuntimeError("환경 변수 CALENDAR_ID가 설정되지 않았습니다.")
+    return CALENDAR_ID
 
 # ========================================
 # 2) Google Calendar API 서비스 객체 생성
 # ========================================
-credentials = service_account.Credentials.from_service_account_file(
-    SERVICE_ACCOUNT_FILE, scopes=SCOPES
-)
-service = build("calendar", "v3", credentials=credentials)
+@lru_cache(maxsize=None)
+def get_credentials():
+    from google.oauth2 import service_account
+
+    return service_account.Credentials.from_service_account_file(
+        SERVICE_ACCOUNT_FILE, scopes=SCOPES
+    )
+
+def get_calendar_service():
+    """
+    Calendar API 서비스 객체 (요청 생성용, 프로세스 전체에서 공유)
+    라이브러리에 포함된 정적 discovery 문서를 사용하므로 discovery 문서를 내려받지 않습니다.
+    요청 실행은 서비스에 내장된 전송 객체 대신 new_calendar_http() 로 만든 객체를 사용합니다.
+    """
+    with _init_lock:
+        return _build_calendar_service()
+
+@lru_cache(maxsize=None)
+def _build_calendar_service():
+    from googleapiclient.discovery import build
+
+    require_calendar_id()
+    return build(
+        "calendar", "v3",
+        credentials=get_credentials(),
+        static_discovery=True,
+        cache_discovery=False
+    )
+
+CALENDAR_HTTP_TIMEOUT = float(os.getenv("CALENDAR_HTTP_TIMEOUT", "30"))
+
+def new_calendar_http():
+    """
+    Calendar API 요청용 인증 HTTP 전송 객체를 새로 만듭니다.
+    httplib2.Http 는 스레드 간에 공유하면 안전하지 않으므로 tools/calendar_api.py 의 풀에서
+    요청마다 하나씩 빌려 씁니다. 자격 증명(토큰)은 모든 전송 객체가 공유합니다.
+    """
+    import httplib2
+    import google_auth_httplib2
+
+    return google_auth_httplib2.AuthorizedHttp(
+        get_credentials(), http=httplib2.Http(timeout=CALENDAR_HTTP_TIMEOUT)
+    )
 
 # ========================================
 # 3) BedrockChat LLM 객체 생성
 # ========================================
-# (Anthropic Claude 3.5 Sonnet 예시, 필요 시 모델 ID 변경)
-llm = BedrockChat(
-    model_id="anthropic.claude-3-5-sonnet-20241022-v2:0",
-    streaming=True,
-    region_name="us-west-2"
-)
\ No newline at end of file
+def get_llm():
+    with _init_lock:
+        return _build_llm()
+
+@lru_cache(maxsize=None)
+def _build_llm():
+    from langchain_community.chat_models import BedrockChat
+
+    return BedrockChat(
+        model_id=BEDROCK_MODEL_ID,
+        streaming=True,
+        region_name=BEDROCK_REGION
+    )
+
+def __getattr__(name):
+    """기존 코드 호환: config.service / config.llm / config.credentials 는 접근할 때 생성"""
+    lazy = {"service": get_calendar_service, "llm": get_llm, "credentials": get_credentials}
+    if name in lazy:
+        return lazy[name]()
+    raise AttributeError(f"module 'config' has no attribute {name!r}")
@@ -1,5 +1,6 @@
-import re
-import streamlit as st
+from typing import NamedTuple
+
+from intents.keyword_matcher import KeywordMatcher
 
 INTENT_KEYWORDS = {
     "PLAN_TRIP": {
@@ -24,47 +25,75 @@ INTENT_KEYWORDS = {
     }
 }
 
-def detect_intent(user_input: str) -> str:
+# 특별 규칙: "공유"가 포함되면 SHARE_PLAN 우선
+BOOST_KEYWORDS = {"공유": ("SHARE_PLAN", 5)}
+
+KEYWORD_WEIGHTS = {"primary": 3, "secondary": 1}
+
+class IntentMatch(NamedTuple):
+    intent: str
+    scores: dict
+    spans: list  # (시작, 끝, 키워드, 인텐트, 가중치)
+
+def _build_rules() -> dict:
+    """키워드 → [(인텐트, 가중치), ...] 규칙표"""
+    rules = {}
+    for intent, keyword_groups in INTENT_KEYWORDS.items():
+        for group, weight in KEYWORD_WEIGHTS.items():
+            for keyword in keyword_groups.get(group, []):
+                rules.setdefault(keyword.lower(), []).append((intent, weight))
+    for keyword, (intent, weight) in BOOST_KEYWORDS.items():
+        rules.setdefault(keyword.lower(), []).append((intent, weight))
+    return rules
+
+_RULES = _build_rules()
+_MATCHER = KeywordMatcher(_RULES.keys())
+
+def match_intent(user_input: str) -> IntentMatch:
     """
-    인텐트 감지 (가중치 및 우선순위 적용)
+    인텐트 감지 (가중치 및 우선순위 적용) - 부수 효과 없는 순수 함수
+    입력을 한 번만 훑어서 인텐트별 점수와 매칭된 위치를 함께 반환합니다.
+    같은 키워드가 여러 번 나와도 한 번만 점수에 반영합니다.
     """
     user_input_lower = user_input.lower()
-    intent_scores = {}
-
-    for intent, keyword_groups in INTENT_KEYWORDS.items():
-        score = 0
-        # Primary 키워드 (가중치 3)
-        for keyword in keyword_groups["primary"]:
-            if keyword in user_input_lower:
-                score += 3
-        # Secondary 키워드 (가중치 1)
-        for keyword in keyword_groups["secondary"]:
-            if keyword in user_input_lower:
-                score += 1
-        if score > 0:
-            intent_scores[intent] = score
-
-    # 특별 규칙: "공유"가 포함되면 SHARE_PLAN 우선
-    if "공유" in user_input_lower:
-        intent_scores["SHARE_PLAN"] = intent_scores.get("SHARE_PLAN", 0) + 5
+    spans = []
+    seen = set()
+    totals = {}
+    for start, end, keyword in _MATCHER.find_all(user_input_lower):
+        for intent, weight in _RULES[keyword]:
+            spans.append((start, end, keyword, intent, weight))
+            if (keyword, intent, weight) in seen:
+                continue
+            seen.add((keyword, intent, weight))
+            totals[intent] = totals.get(intent, 0) + weight
 
+    # 동점일 때는 INTENT_KEYWORDS 순서가 앞선 인텐트를 선택
+    intent_scores = {intent: totals[intent] for intent in INTENT_KEYWORDS if totals.get(intent, 0) > 0}
     if not intent_scores:
-        return "OTHER"
+        return IntentMatch("OTHER", {}, spans)
 
     best_intent = max(intent_scores, key=intent_scores.get)
-    debug_info = f"인텐트 점수: {intent_scores} → 선택: {best_intent}"
-    st.write(f"🔍 {debug_info}")
-    return best_intent
+    return IntentMatch(best_intent, intent_scores, spans)
+
+def detect_intent(user_input: str) -> str:
+    """
+    인텐트 감지 (가중치 및 우선순위 적용)
+    """
+    return match_intent(user_input).intent
+
+def detect_intents(user_inputs: list) -> list:
+    """여러 발화를 한 번에 분류 (배치 API)"""
+    return [match_intent(user_input) for user_input in user_inputs]
 
 def filter_tools_by_intent(intent: str, all_tools: list) -> list:
     """
     인텐트에 따라 사용 가능한 도구(툴) 필터링
     """
     tool_mapping = {
-        "PLAN_TRIP": ["search_place", "plan_trip_tool"],
+        "PLAN_TRIP": ["search_place", "search_places_batch", "plan_trip_tool"],
         "BOOK_CALENDAR": ["create_calendar_from_plan", "create_event_tool", "check_event_exists"],
         "SHARE_PLAN": ["share_travel_plan_gist", "share_gist_tool", "debug_share_status"],
-        "SEARCH_PLACE": ["search_place"],
+        "SEARCH_PLACE": ["search_place", "search_places_batch"],
         "MANAGE_EVENT": ["list_events_tool", "update_event_tool", "delete_event_tool", "check_event_exists"],
         "OTHER": all_tools
     }
@@ -0,0 +1,61 @@
+from collections import deque
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 기반 다중 키워드 매처
+    키워드 수와 상관없이 입력 문자열을 한 번만 훑어서, 겹치는 매칭까지 모두 찾습니다.
+    (예: "공유해줘" 안의 "공유"도 함께 매칭)
+    """
+
+    def __init__(self, keywords):
+        # 트라이: 노드별 자식(goto), 실패 링크(fail), 해당 노드에서 끝나는 키워드 목록(output)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for keyword in keywords:
+            if keyword:
+                self._add(keyword)
+        self._build_fail_links()
+
+    def _add(self, keyword: str):
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        if keyword not in self._output[node]:
+            self._output[node].append(keyword)
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                # 실패 링크가 가리키는 노드의 출력도 함께 상속 (접미사 키워드)
+                self._output[child] = self._output[child] + [
+                    keyword for keyword in self._output[self._fail[child]]
+                    if keyword not in self._output[child]
+                ]
+
+    def find_all(self, text: str) -> list:
+        """(시작, 끝, 키워드) 목록을 끝 위치 순서대로 반환"""
+        matches = []
+        node = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for keyword in output[node]:
+                matches.append((index + 1 - len(keyword), index + 1, keyword))
+        return matches
@@ -0,0 +1,162 @@
+import time
+import uuid
+import threading
+from typing import NamedTuple, Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from intents.intent_detector import match_intent, IntentMatch
+from utils.utils import safe_add_message_to_memory, sanitize_input, extract_actual_response
+from utils.session import bind_session
+from utils.plan_store import append_assistant_message
+from utils.conversation_context import build_conversation_context
+from utils.tracing import trace_turn, span, TracingCallbackHandler
+
+# ========================================
+# 화면(Streamlit)과 무관한 플래너 핵심 로직
+# 모든 함수는 명시적인 세션(PlannerSession)을 받아 그 상태만 읽고 씁니다.
+# ========================================
+WELCOME_TEXT = "안녕하세요! AI 여행 플래너입니다."
+
+class PlannerSession:
+    """
+    사용자 1명의 대화 세션
+    state 는 dict 처럼 쓸 수 있는 객체면 되며, Streamlit 에서는 st.session_state 를 그대로 넘깁니다.
+    같은 세션의 턴은 lock 으로 순서대로 처리합니다.
+    """
+
+    def __init__(self, state=None, session_id: str = None):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.state = state if state is not None else {}
+        self.lock = threading.RLock()
+        self.last_active = time.monotonic()
+        init_session_state(self.state)
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+class TurnResult(NamedTuple):
+    intent: str
+    response: str
+    fast_path: bool = False
+    error: Optional[str] = None
+    trace: Optional[dict] = None  # run_turn 으로 실행했을 때의 트레이스 (스팬, 소요 시간)
+
+def init_session_state(state):
+    """대화 기록과 메모리가 없으면 만들고 환영 메시지를 추가"""
+    from langchain.memory import ConversationBufferMemory
+
+    if "memory" not in state:
+        state["memory"] = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    if "messages" not in state:
+        state["messages"] = []
+        with bind_session(state):
+            append_assistant_message(WELCOME_TEXT)
+        safe_add_message_to_memory(state["memory"], AIMessage(content=WELCOME_TEXT))
+
+def _add_user_message(session: PlannerSession, content: str):
+    session.state["messages"].append({"role": "user", "content": content})
+    safe_add_message_to_memory(session.state["memory"], HumanMessage(content=content))
+
+def _add_assistant_message(session: PlannerSession, content: str, intent: str = None):
+    if append_assistant_message(content) and intent == "PLAN_TRIP":
+        # 계획 생성 턴 → 다음에 올 가능성이 큰 예약 요청을 위해 이벤트 변환/캘린더 조회를 미리 시작
+        from tools.booking_prefetch import start_booking_prefetch
+
+        start_booking_prefetch()
+    safe_add_message_to_memory(session.state["memory"], AIMessage(content=content))
+
+def add_assistant_message(session: PlannerSession, content: str):
+    """턴 밖에서 만들어진 응답(예: 백그라운드 예약 결과)을 대화 기록에 추가"""
+    with session.lock, bind_session(session.state):
+        _add_assistant_message(session, content)
+
+# ========================================
+# 1) 채팅 턴
+# ========================================
+def begin_turn(session: PlannerSession, user_input: str) -> IntentMatch:
+    """턴 1단계: 인텐트를 감지하고 사용자 메시지를 기록"""
+    with session.lock, bind_session(session.state):
+        session.touch()
+        with span("intent", "match_intent"):
+            intent_match = match_intent(user_input)
+        _add_user_message(session, user_input)
+        return intent_match
+
+def respond(session: PlannerSession, user_input: str, intent: str) -> TurnResult:
+    """
+    턴 2단계: 빠른 경로 또는 인텐트별 에이전트로 응답을 만들고 기록
+    에이전트 오류는 예외 대신 error 가 채워진 결과로 반환합니다.
+    """
+    from agents.agent_factory import create_intent_based_agent
+    from agents.fast_path import route_fast_path
+
+    with session.lock, bind_session(session.state):
+        session.touch()
+        fast_path = False
+        error = None
+        try:
+            # 도구가 확정되는 단순 요청은 에이전트 없이 바로 처리 (LLM 호출 0회)
+            with span("fast_path", intent) as fast_info:
+                response = route_fast_path(intent, user_input)
+                fast_path = fast_info["hit"] = response is not None
+            if response is None:
+                with span("agent_build", intent):
+                    agent = create_intent_based_agent(intent, user_input)
+                # 인텐트별 토큰 예산 안에서 최신 계획 + 최근 대화 + 이전 대화 요약으로 구성
+                conversation_context = build_conversation_context(intent, user_input)
+                enhanced_prompt = f"{conversation_context}\n\n현재 요청: {sanitize_input(user_input)}"
+
+                with span("agent_run", intent, prompt_chars=len(enhanced_prompt)):
+                    raw_response = agent.run(enhanced_prompt, callbacks=[TracingCallbackHandler()])
+                response = extract_actual_response(raw_response)
+
+        except Exception as e:
+            error_message = str(e)
+            if "Could not parse LLM output:" in error_message:
+                response = extract_actual_response(error_message)
+            else:
+                response = f"⚠️ 시스템 오류: {error_message}"
+                error = error_message
+
+        _add_assistant_message(session, response, intent)
+        return TurnResult(intent, response, fast_path, error)
+
+def run_turn(session: PlannerSession, user_input: str) -> TurnResult:
+    """사용자 입력 1건을 처리 (인텐트 감지 → 응답 생성), 트레이스를 함께 반환"""
+    with session.lock, trace_turn() as turn:
+        intent_match = begin_turn(session, user_input)
+        turn["attrs"]["intent"] = intent_match.intent
+        result = respond(session, user_input, intent_match.intent)
+    return result._replace(trace=turn)
+
+# ========================================
+# 2) 에이전트 없이 바로 실행하는 작업 (계획 / 예약 / 공유)
+# ========================================
+def _run_tool(session: PlannerSession, intent: str, tool, tool_input: str, user_text: str) -> TurnResult:
+    with session.lock, trace_turn(intent=intent, direct=True) as turn, bind_session(session.state):
+        session.touch()
+        _add_user_message(session, user_text)
+        with span("tool", tool.name):
+            response = tool.invoke(tool_input)
+        _add_assistant_message(session, response, intent)
+    return TurnResult(intent, response, fast_path=True, trace=turn)
+
+def plan_trip(session: PlannerSession, request: str) -> TurnResult:
+    """여행 계획 생성 (plan_trip_tool 직접 호출)"""
+    from tools.travel_tools import plan_trip_tool
+
+    return _run_tool(session, "PLAN_TRIP", plan_trip_tool, request, request)
+
+def book_calendar(session: PlannerSession, start_date: str = "") -> TurnResult:
+    """최신 여행 계획을 캘린더에 등록 (start_date 예: "25년 6월 20일", "2025-06-20")"""
+    from tools.travel_tools import create_calendar_from_plan
+
+    user_text = f"{start_date} 시작으로 캘린더 예약해줘" if start_date else "캘린더 예약해줘"
+    return _run_tool(session, "BOOK_CALENDAR", create_calendar_from_plan, start_date, user_text)
+
+def share_plan(session: PlannerSession) -> TurnResult:
+    """최신 여행 계획을 Gist 로 공유"""
+    from tools.share_tools import share_travel_plan_gist
+
+    return _run_tool(session, "SHARE_PLAN", share_travel_plan_gist, "", "여행 계획 공유해줘")
@@ -0,0 +1,285 @@
+"""
+플래너 HTTP API 서버 (표준 라이브러리 asyncio 기반)
+
+    python -m planner.server [--host 127.0.0.1] [--port 8080]
+
+POST /sessions                     → {"session_id": ...}
+GET  /sessions/{id}                → 대화 기록
+POST /sessions/{id}/chat           {"message": "..."}       → 채팅 1턴 (인텐트 감지 + 에이전트)
+POST /sessions/{id}/plan           {"request": "..."}       → 여행 계획 생성
+POST /sessions/{id}/book           {"start_date": "..."}    → 최신 계획 캘린더 예약 (백그라운드 작업 제출)
+POST /sessions/{id}/share                                   → 최신 계획 Gist 공유
+GET  /sessions/{id}/jobs                                    → 세션의 예약 작업 진행 상황
+GET  /jobs/{job_id}                                         → 예약 작업 상태와 이벤트별 결과
+POST /jobs/{job_id}/retry                                   → 완료되지 않은 이벤트만 다시 예약
+GET  /health
+
+연결 처리는 이벤트 루프 하나에서 하고, LLM/외부 API 를 호출하는 턴은 스레드 풀에서 실행합니다.
+세션마다 턴은 순서대로, 서로 다른 세션은 동시에 처리됩니다.
+"""
+from dotenv import load_dotenv
+# config 등 프로젝트 모듈이 import 시점에 환경 변수를 읽으므로 가장 먼저 .env 로드
+load_dotenv()
+
+import os
+import re
+import json
+import time
+import asyncio
+import argparse
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from planner.core import PlannerSession, run_turn, plan_trip, book_calendar, share_plan
+from tools.booking_jobs import get_booking_queue, SESSION_JOBS_KEY
+from utils.tracing import summarize_turn
+
+# ========================================
+# 서버 설정
+# ========================================
+API_HOST = os.getenv("PLANNER_API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("PLANNER_API_PORT", "8080"))
+API_WORKERS = int(os.getenv("PLANNER_API_WORKERS", "16"))
+SESSION_IDLE_TTL = float(os.getenv("PLANNER_SESSION_TTL", "3600"))
+MAX_BODY_BYTES = 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 15
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+# ========================================
+# 1) 세션 저장소
+# ========================================
+class SessionStore:
+    """메모리 내 세션 저장소 (일정 시간 사용하지 않은 세션은 정리)"""
+
+    def __init__(self, idle_ttl: float = SESSION_IDLE_TTL):
+        self.idle_ttl = idle_ttl
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self) -> PlannerSession:
+        session = PlannerSession()
+        with self._lock:
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> PlannerSession:
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"세션을 찾을 수 없습니다: {session_id}")
+        return session
+
+    def evict_idle(self) -> int:
+        deadline = time.monotonic() - self.idle_ttl
+        with self._lock:
+            expired = [sid for sid, session in self._sessions.items() if session.last_active < deadline]
+            for sid in expired:
+                del self._sessions[sid]
+        return len(expired)
+
+    def __len__(self):
+        return len(self._sessions)
+
+# ========================================
+# 2) 요청 처리 (스레드 풀에서 실행)
+# ========================================
+def _turn_payload(session: PlannerSession, result) -> dict:
+    trace = result.trace or {}
+    return {
+        "session_id": session.session_id,
+        "intent": result.intent,
+        "response": result.response,
+        "fast_path": result.fast_path,
+        "error": result.error,
+        "duration_ms": round(trace.get("duration_ms", 0.0), 1),
+        "spans_ms": {kind: round(ms, 1) for kind, ms in summarize_turn(trace).items()},
+    }
+
+def _require(body: dict, field: str) -> str:
+    value = str(body.get(field, "")).strip()
+    if not value:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"'{field}' 값이 필요합니다.")
+    return value
+
+def handle_create(store, body, session_id=None):
+    return HTTPStatus.CREATED, {"session_id": store.create().session_id}
+
+def handle_history(store, body, session_id):
+    session = store.get(session_id)
+    with session.lock:
+        return HTTPStatus.OK, {"session_id": session_id, "messages": list(session.state["messages"])}
+
+def handle_chat(store, body, session_id):
+    session = store.get(session_id)
+    return HTTPStatus.OK, _turn_payload(session, run_turn(session, _require(body, "message")))
+
+def handle_plan(store, body, session_id):
+    session = store.get(session_id)
+    return HTTPStatus.OK, _turn_payload(session, plan_trip(session, _require(body, "request")))
+
+def handle_book(store, body, session_id):
+    session = store.get(session_id)
+    return HTTPStatus.OK, _turn_payload(session, book_calendar(session, str(body.get("start_date", "")).strip()))
+
+def handle_share(store, body, session_id):
+    session = store.get(session_id)
+    return HTTPStatus.OK, _turn_payload(session, share_plan(session))
+
+def _job_summary(job: dict) -> dict:
+    return {key: job[key] for key in ("job_id", "label", "status", "error", "total", "done", "failed")}
+
+def handle_session_jobs(store, body, session_id):
+    session = store.get(session_id)
+    queue = get_booking_queue()
+    jobs = [queue.status(job_id) for job_id in session.state.get(SESSION_JOBS_KEY, [])]
+    return HTTPStatus.OK, {"session_id": session_id, "jobs": [_job_summary(job) for job in jobs if job]}
+
+def handle_job(store, body, job_id):
+    job = get_booking_queue().status(job_id)
+    if job is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"예약 작업을 찾을 수 없습니다: {job_id}")
+    return HTTPStatus.OK, job
+
+def handle_job_retry(store, body, job_id):
+    queue = get_booking_queue()
+    if queue.status(job_id) is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"예약 작업을 찾을 수 없습니다: {job_id}")
+    return HTTPStatus.ACCEPTED, {"job_id": job_id, "restarted": queue.retry(job_id)}
+
+ROUTES = [
+    ("POST", re.compile(r"^/sessions$"), handle_create),
+    ("GET", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)$"), handle_history),
+    ("POST", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/chat$"), handle_chat),
+    ("POST", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/plan$"), handle_plan),
+    ("POST", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/book$"), handle_book),
+    ("POST", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/share$"), handle_share),
+    ("GET", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/jobs$"), handle_session_jobs),
+    ("GET", re.compile(r"^/jobs/(?P<job_id>[0-9a-f]+)$"), handle_job),
+    ("POST", re.compile(r"^/jobs/(?P<job_id>[0-9a-f]+)/retry$"), handle_job_retry),
+]
+
+# ========================================
+# 3) asyncio HTTP/1.1 서버
+# ========================================
+class PlannerServer:
+    def __init__(self, host: str = API_HOST, port: int = API_PORT, workers: int = API_WORKERS,
+                 store: SessionStore = None):
+        self.host = host
+        self.port = port
+        self.store = store or SessionStore()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="planner")
+        self._server = None
+
+    async def _read_request(self, reader):
+        request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "잘못된 요청입니다.")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "요청 본문이 너무 큽니다.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"status": "ok", "sessions": len(self.store)}
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "본문이 올바른 JSON 이 아닙니다.")
+        if not isinstance(payload, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "본문은 JSON 객체여야 합니다.")
+
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self.executor, partial(handler, self.store, payload, **match.groupdict())
+                )
+        raise ApiError(HTTPStatus.NOT_FOUND, f"{method} {path} 경로가 없습니다.")
+
+    @staticmethod
+    def _write_response(writer, status: HTTPStatus, payload: dict, keep_alive: bool):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+        )
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload = await self._dispatch(method, path, body)
+                except ApiError as e:
+                    status, payload, keep_alive = e.status, {"error": str(e)}, False
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, payload, keep_alive = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}, False
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(60)
+            self.store.evict_idle()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        evictor = asyncio.create_task(self._evict_loop())
+        print(f"🚀 플래너 API 서버 실행 중: http://{self.host}:{self.port}")
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            evictor.cancel()
+            self.executor.shutdown(wait=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI 여행 플래너 HTTP API 서버")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(PlannerServer(args.host, args.port, args.workers).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
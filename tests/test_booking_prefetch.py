@@ -0,0 +1,69 @@
+import os
+import tempfile
+
+# 프로젝트 모듈이 만드는 캐시/추적 파일을 임시 폴더에 두도록 import 전에 설정
+os.environ.setdefault("TRAVEL_PLANNER_CACHE_DIR", tempfile.mkdtemp(prefix="travel_planner_test_"))
+
+from utils.session import bind_session
+from utils import plan_store
+from tools import booking_prefetch
+
+UNDATED_PLAN = """부산 2일 여행 일정입니다.
+Day1:
+ - 09:00~10:00 : 해운대 산책
+ - 12:00~13:00 : 돼지국밥 점심
+Day2:
+ - 10:00~11:30 : 감천문화마을
+"""
+
+LLM_EVENTS = """해운대 산책;2026-11-01T09:00:00+09:00;2026-11-01T10:00:00+09:00
+돼지국밥 점심;2026-11-01T12:00:00+09:00;2026-11-01T13:00:00+09:00
+감천문화마을;2026-11-02T10:00:00+09:00;2026-11-02T11:30:00+09:00
+"""
+
+def test_undated_plan_is_indexed_and_converted_by_full_llm_fallback(monkeypatch):
+    """날짜 없는 헤더의 계획은 인덱스에 남고, 시작 날짜 없이 예약하면 계획 전체를 LLM 으로 변환"""
+    prompts = []
+
+    def fake_generate(prompt, tool, context=None, bypass=False, stream_output=True):
+        prompts.append(prompt)
+        return LLM_EVENTS
+
+    monkeypatch.setattr(booking_prefetch, "cached_generate", fake_generate)
+
+    with bind_session({"messages": []}):
+        assert plan_store.append_assistant_message(UNDATED_PLAN)
+        plan_version = plan_store.get_latest_plan_version()
+        assert not plan_version["parsed"].events
+
+        plan_events, errors, content = booking_prefetch.prepare_plan_events(plan_version, None, "캘린더에 등록해줘")
+
+    assert len(prompts) == 1
+    assert "Day2:" in prompts[0]  # 해석하지 못한 줄만이 아니라 계획 전체를 전달
+    assert content == LLM_EVENTS
+    assert errors == []
+    assert [(event.summary, event.start, event.day) for event in plan_events] == [
+        ("해운대 산책", "2026-11-01T09:00:00+09:00", 1),
+        ("돼지국밥 점심", "2026-11-01T12:00:00+09:00", 1),
+        ("감천문화마을", "2026-11-02T10:00:00+09:00", 2),
+    ]
+
+def test_undated_plan_with_start_date_skips_llm(monkeypatch):
+    """시작 날짜를 주면 로컬 파서만으로 이벤트를 만들고 LLM 은 호출하지 않음"""
+    monkeypatch.setattr(booking_prefetch, "cached_generate", _fail_llm)
+
+    with bind_session({"messages": []}):
+        plan_store.append_assistant_message(UNDATED_PLAN)
+        plan_version = plan_store.get_latest_plan_version()
+        plan_events, errors, content = booking_prefetch.prepare_plan_events(plan_version, "2026-11-01", "")
+
+    assert content == ""
+    assert errors == []
+    assert [event.start for event in plan_events] == [
+        "2026-11-01T09:00:00+09:00",
+        "2026-11-01T12:00:00+09:00",
+        "2026-11-02T10:00:00+09:00",
+    ]
+
+def _fail_llm(*args, **kwargs):
+    raise AssertionError("LLM 을 호출하면 안 됩니다")
@@ -0,0 +1,351 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.cache import CACHE_DIR
+from utils.plan_parser import PlanEvent
+from utils.tracing import trace_turn
+from tools.calendar_api import calendar_priority, PRIORITY_BULK
+from tools.calendar_sync import (
+    make_trip_key,
+    make_event_id,
+    fetch_trip_events,
+    compute_diff,
+    apply_diff_outcomes
+)
+
+# ========================================
+# 백그라운드 캘린더 예약 작업
+# 채팅 턴은 작업을 제출하고 바로 반환하며, 작업 상태와 이벤트별 결과는 SQLite에 저장합니다.
+# 이벤트 ID가 (여행, 일차, 순번)으로 결정되므로 중단된 작업을 다시 실행해도 중복 등록되지 않습니다.
+# ========================================
+BOOKING_WORKERS = int(os.getenv("BOOKING_WORKERS", "2"))
+# 진행 상황을 기록하는 단위 (이벤트 수)
+BOOKING_PROGRESS_CHUNK = int(os.getenv("BOOKING_PROGRESS_CHUNK", "10"))
+BOOKING_JOB_DB = os.getenv("BOOKING_JOB_DB", os.path.join(CACHE_DIR, "booking_jobs.sqlite"))
+# 실행 중인 작업의 소유 표시(heartbeat)를 갱신하는 주기와, 갱신이 끊긴 작업을 다른 프로세스가 가져가는 기준(초)
+BOOKING_HEARTBEAT_INTERVAL = float(os.getenv("BOOKING_HEARTBEAT_INTERVAL", "10"))
+BOOKING_JOB_STALE_AFTER = float(os.getenv("BOOKING_JOB_STALE_AFTER", "60"))
+
+# 세션 상태에 이 세션이 제출한 작업 ID 목록을 저장하는 키
+SESSION_JOBS_KEY = "booking_jobs"
+
+# 작업 상태
+QUEUED, RUNNING, DONE, PARTIAL, FAILED = "queued", "running", "done", "partial", "failed"
+FINISHED_STATUSES = (DONE, PARTIAL, FAILED)
+
+class BookingJobStore:
+    """
+    작업(jobs)과 이벤트별 결과(job_events)를 저장하는 SQLite 저장소
+    같은 DB 를 여러 프로세스(Streamlit 앱, API 서버)가 함께 쓰므로 작업마다 소유자(owner)와
+    마지막 heartbeat 시각을 기록하고, 소유자가 없거나 heartbeat 가 끊긴 작업만 가져가 실행합니다.
+    """
+
+    def __init__(self, path: str = BOOKING_JOB_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY, trip_key TEXT NOT NULL, label TEXT, status TEXT NOT NULL,"
+            " error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL, owner TEXT, heartbeat_at REAL);"
+            "CREATE TABLE IF NOT EXISTS job_events ("
+            " job_id TEXT NOT NULL, event_id TEXT NOT NULL, seq INTEGER NOT NULL, action TEXT NOT NULL,"
+            " summary TEXT NOT NULL, payload TEXT, status TEXT NOT NULL, message TEXT,"
+            " PRIMARY KEY (job_id, event_id));"
+        )
+        # 소유자 컬럼이 없던 기존 DB 에 컬럼 추가
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._db.commit()
+
+    def create(self, trip_key: str, plan_events: list, label: str = "", owner: str = None) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (job_id, trip_key, label, status, error, created_at, updated_at, owner, heartbeat_at)"
+                " VALUES (?, ?, ?, ?, NULL, ?, ?, ?, ?)",
+                (job_id, trip_key, label, QUEUED, now, now, owner, now if owner else None)
+            )
+            self._db.executemany(
+                "INSERT INTO job_events VALUES (?, ?, ?, 'sync', ?, ?, 'pending', NULL)",
+                [
+                    (job_id, make_event_id(trip_key, event.day, event.slot), seq, event.summary,
+                     json.dumps(event._asdict(), ensure_ascii=False))
+                    for seq, event in enumerate(plan_events)
+                ]
+            )
+            self._db.commit()
+        return job_id
+
+    def set_status(self, job_id: str, status: str, error: str = None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status, error, time.time(), job_id)
+            )
+            self._db.commit()
+
+    def record_outcomes(self, job_id: str, outcomes: list, summaries: dict = None):
+        """apply_diff_outcomes() 결과를 이벤트별로 저장 (삭제된 이벤트는 새 행으로 추가)"""
+        summaries = summaries or {}
+        with self._lock:
+            next_seq = self._db.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM job_events WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            for event_id, action, ok, message in outcomes:
+                status = "done" if ok else "failed"
+                updated = self._db.execute(
+                    "UPDATE job_events SET action = ?, status = ?, message = ? WHERE job_id = ? AND event_id = ?",
+                    (action, status, message, job_id, event_id)
+                ).rowcount
+                if not updated:
+                    self._db.execute(
+                        "INSERT INTO job_events VALUES (?, ?, ?, ?, ?, NULL, ?, ?)",
+                        (job_id, event_id, next_seq, action, summaries.get(event_id, ""), status, message)
+                    )
+                    next_seq += 1
+            self._db.execute("UPDATE jobs SET updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+            self._db.commit()
+
+    def pending_events(self, job_id: str) -> list:
+        """아직 완료되지 않은(대기/실패) 이벤트"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT payload FROM job_events WHERE job_id = ? AND payload IS NOT NULL AND status != 'done' ORDER BY seq",
+                (job_id,)
+            ).fetchall()
+        return [PlanEvent(**json.loads(row[0])) for row in rows]
+
+    def all_events(self, job_id: str) -> list:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT payload FROM job_events WHERE job_id = ? AND payload IS NOT NULL ORDER BY seq", (job_id,)
+            ).fetchall()
+        return [PlanEvent(**json.loads(row[0])) for row in rows]
+
+    def get(self, job_id: str):
+        """작업 상태와 진행률 (없으면 None)"""
+        with self._lock:
+            job = self._db.execute(
+                "SELECT job_id, trip_key, label, status, error, created_at, updated_at FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            events = self._db.execute(
+                "SELECT event_id, action, summary, status, message, payload IS NOT NULL "
+                "FROM job_events WHERE job_id = ? ORDER BY seq",
+                (job_id,)
+            ).fetchall()
+        keys = ("job_id", "trip_key", "label", "status", "error", "created_at", "updated_at")
+        result = dict(zip(keys, job))
+        planned = [row for row in events if row[5]]
+        result["events"] = [
+            dict(zip(("event_id", "action", "summary", "status", "message"), row[:5])) for row in events
+        ]
+        result["total"] = len(planned)
+        result["done"] = sum(1 for row in planned if row[3] == "done")
+        result["failed"] = sum(1 for row in planned if row[3] == "failed")
+        return result
+
+    def claim(self, job_id: str, owner: str, stale_after: float = BOOKING_JOB_STALE_AFTER) -> bool:
+        """
+        작업의 소유자가 되면 True
+        이미 내 작업이거나, 소유자가 없거나, 끝난 작업이거나, 소유자의 heartbeat 가 끊긴 경우에만 가져옵니다.
+        조건 검사와 변경을 UPDATE 한 번으로 처리하므로 여러 프로세스가 동시에 가져가지 않습니다.
+        """
+        now = time.time()
+        with self._lock:
+            claimed = self._db.execute(
+                "UPDATE jobs SET owner = ?, heartbeat_at = ? WHERE job_id = ? AND ("
+                " owner IS NULL OR owner = ? OR heartbeat_at IS NULL OR heartbeat_at < ? OR status IN (?, ?, ?))",
+                (owner, now, job_id, owner, now - stale_after, *FINISHED_STATUSES)
+            ).rowcount
+            self._db.commit()
+        return claimed == 1
+
+    def heartbeat(self, job_ids: list, owner: str):
+        """실행 중인 내 작업의 heartbeat 갱신"""
+        if not job_ids:
+            return
+        with self._lock:
+            self._db.executemany(
+                "UPDATE jobs SET heartbeat_at = ? WHERE job_id = ? AND owner = ?",
+                [(time.time(), job_id, owner) for job_id in job_ids]
+            )
+            self._db.commit()
+
+    def unfinished(self, stale_after: float = BOOKING_JOB_STALE_AFTER) -> list:
+        """대기 중이거나 실행 중인 작업 중 소유자가 없거나 heartbeat 가 끊긴 작업 (프로세스 종료 등)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT job_id FROM jobs WHERE status IN (?, ?)"
+                " AND (owner IS NULL OR heartbeat_at IS NULL OR heartbeat_at < ?) ORDER BY created_at",
+                (QUEUED, RUNNING, time.time() - stale_after)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+# ========================================
+# 작업 실행
+# ========================================
+def run_job(store: BookingJobStore, job_id: str, existing: dict = None):
+    """
+    작업 실행 (재실행 시 완료된 이벤트는 건너뜀)
+    여행 이벤트를 한 번 조회해 diff 를 계산한 뒤 BOOKING_PROGRESS_CHUNK 개씩 반영하며 진행 상황을 저장합니다.
+    existing 을 주면(예약 사전 준비에서 미리 조회한 캘린더 상태) 조회를 생략합니다.
+    Calendar 호출은 PRIORITY_BULK 우선순위로 실행되어 대화 중 요청이 먼저 처리됩니다.
+    """
+    job = store.get(job_id)
+    if job is None or job["status"] == DONE:
+        return
+    store.set_status(job_id, RUNNING)
+    # 대량 쓰기는 대화 중 조회/변경보다 뒤로 양보
+    with trace_turn(intent="BOOK_CALENDAR", job_id=job_id), calendar_priority(PRIORITY_BULK):
+        try:
+            trip_key = job["trip_key"]
+            if existing is None:
+                existing = fetch_trip_events(trip_key)
+            # 삭제 대상은 작업 전체 계획 기준으로 계산 (재실행 시에도 계획에 없는 이벤트만 삭제)
+            full_diff = compute_diff(trip_key, store.all_events(job_id), existing)
+            pending_ids = {make_event_id(trip_key, event.day, event.slot) for event in store.pending_events(job_id)}
+
+            changes = [("insert", item) for item in full_diff["insert"]] + [("patch", item) for item in full_diff["patch"]]
+            changes = [(kind, item) for kind, item in changes if item[1]["id"] in pending_ids]
+            noop = [item for item in full_diff["noop"] if item[1]["id"] in pending_ids]
+            if noop:
+                store.record_outcomes(job_id, apply_diff_outcomes(
+                    {"insert": [], "patch": [], "delete": [], "noop": noop}
+                ))
+
+            for i in range(0, len(changes), BOOKING_PROGRESS_CHUNK):
+                chunk = changes[i:i + BOOKING_PROGRESS_CHUNK]
+                store.record_outcomes(job_id, apply_diff_outcomes({
+                    "insert": [item for kind, item in chunk if kind == "insert"],
+                    "patch": [item for kind, item in chunk if kind == "patch"],
+                    "delete": [],
+                    "noop": [],
+                }))
+
+            if full_diff["delete"]:
+                store.record_outcomes(
+                    job_id,
+                    apply_diff_outcomes({"insert": [], "patch": [], "delete": full_diff["delete"], "noop": []}),
+                    summaries={current["id"]: current.get("summary", "") for current in full_diff["delete"]}
+                )
+        except Exception as e:
+            store.set_status(job_id, FAILED, str(e))
+            return
+
+    job = store.get(job_id)
+    store.set_status(job_id, PARTIAL if job["failed"] else DONE)
+
+class BookingJobQueue:
+    """
+    예약 작업 워커 풀
+    실행 중인 작업의 heartbeat 를 주기적으로 갱신하고, 다른 프로세스가 종료되어 heartbeat 가 끊긴 작업만 이어서 실행합니다.
+    """
+
+    def __init__(self, store: BookingJobStore = None, workers: int = BOOKING_WORKERS):
+        self.store = store or BookingJobStore()
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="booking")
+        self._active = set()
+        self._lock = threading.Lock()
+        self._resume_stale()
+        threading.Thread(target=self._heartbeat_loop, name="booking-heartbeat", daemon=True).start()
+
+    def _resume_stale(self):
+        for job_id in self.store.unfinished():
+            self._start(job_id)
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(BOOKING_HEARTBEAT_INTERVAL)
+            try:
+                with self._lock:
+                    active = list(self._active)
+                self.store.heartbeat(active, self.owner)
+                self._resume_stale()
+            except Exception:
+                # DB 잠금 등 일시적인 오류는 다음 주기에 다시 시도
+                continue
+
+    def _start(self, job_id: str, existing: dict = None) -> bool:
+        with self._lock:
+            if job_id in self._active:
+                return False
+            # 다른 프로세스가 실행 중인 작업은 가져오지 않음
+            if not self.store.claim(job_id, self.owner):
+                return False
+            self._active.add(job_id)
+
+        def _run():
+            try:
+                run_job(self.store, job_id, existing)
+            finally:
+                with self._lock:
+                    self._active.discard(job_id)
+        self._executor.submit(_run)
+        return True
+
+    def submit(self, plan_events: list, label: str = "", existing: dict = None) -> str:
+        """작업 제출 (existing: 미리 조회한 여행 이벤트 상태, 첫 실행에만 사용)"""
+        job_id = self.store.create(make_trip_key(plan_events), plan_events, label, owner=self.owner)
+        self._start(job_id, existing)
+        return job_id
+
+    def retry(self, job_id: str) -> bool:
+        """실패/부분 완료 작업에서 완료되지 않은 이벤트만 다시 실행"""
+        job = self.store.get(job_id)
+        if job is None or job["status"] == DONE:
+            return False
+        if job["status"] in FINISHED_STATUSES and self.store.claim(job_id, self.owner):
+            self.store.set_status(job_id, QUEUED)
+        return self._start(job_id)
+
+    def status(self, job_id: str):
+        return self.store.get(job_id)
+
+    def wait(self, job_id: str, timeout: float = None, interval: float = 0.2):
+        """작업이 끝날 때까지(또는 timeout 초까지) 기다린 뒤 상태 반환"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.store.get(job_id)
+            if job is None or job["status"] in FINISHED_STATUSES:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(interval)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_booking_queue() -> BookingJobQueue:
+    """프로세스 전역 예약 작업 큐"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = BookingJobQueue()
+        return _queue
+
+def format_job_progress(job: dict) -> str:
+    """작업 진행 상황 요약 한 줄"""
+    labels = {QUEUED: "⏳ 대기 중", RUNNING: "🔄 진행 중", DONE: "✅ 완료", PARTIAL: "⚠️ 일부 실패", FAILED: "❌ 실패"}
+    return (
+        f"{labels.get(job['status'], job['status'])} · {job['done']}/{job['total']}개 완료"
+        + (f" · 실패 {job['failed']}개" if job["failed"] else "")
+        + (f" · {job['error']}" if job.get("error") else "")
+    )
+
+def format_job_result(job: dict) -> str:
+    """완료된 작업의 이벤트별 결과 메시지 (기존 동기 예약 결과와 같은 형식)"""
+    header = f"🗓️ 캘린더 예약 {'완료' if job['status'] == DONE else '결과'} (시작일: {job['label'] or job['trip_key']}):\n"
+    return header + "\n".join(event["message"] for event in job["events"] if event["message"])
@@ -0,0 +1,156 @@
+import os
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.plan_parser import parse_plan, to_event_line
+from utils.plan_store import get_latest_plan_version
+from utils.llm_cache import cached_generate
+from utils.session import get_session_state
+from utils.tracing import trace_turn
+from tools.calendar_api import calendar_priority, PRIORITY_BULK
+from tools.calendar_sync import plan_events_from_lines, make_trip_key, fetch_trip_events, compute_diff
+
+# ========================================
+# 예약 사전 준비 (계획 생성 직후 백그라운드 실행)
+# 계획 다음에는 대개 예약 요청이 오므로, 이벤트 변환과 캘린더 조회를 미리 해 두고
+# 예약 턴에서는 쓰기만 남깁니다. 계획이 바뀌면 새 계획 기준으로 다시 준비합니다.
+# ========================================
+BOOKING_PREFETCH = os.getenv("BOOKING_PREFETCH", "1").lower() not in ("0", "false", "no")
+# 미리 조회한 캘린더 상태를 믿는 최대 시간(초) - 지나면 예약 작업이 다시 조회
+PREFETCH_MAX_AGE = float(os.getenv("BOOKING_PREFETCH_MAX_AGE", "120"))
+# 예약 요청 시 아직 진행 중인 사전 준비를 기다리는 최대 시간(초)
+PREFETCH_WAIT = float(os.getenv("BOOKING_PREFETCH_WAIT", "20"))
+
+# 세션 상태에 사전 준비 결과를 저장하는 키
+SESSION_PREFETCH_KEY = "booking_prefetch"
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+class PreparedBooking(NamedTuple):
+    plan_events: list
+    errors: list
+    content: str  # LLM 보정 결과 (없으면 "")
+    existing: Optional[dict]  # 여행 이벤트의 캘린더 상태 (조회 실패 시 None)
+    diff_counts: dict  # insert/patch/delete/noop 개수
+    fetched_at: float
+
+def _llm_parse_events(plan_text: str, user_specified_date: str, input: str) -> str:
+    """형식에 맞지 않는 일정 줄만 LLM으로 "제목;시작시간;종료시간" 형식 변환 (보조 경로)"""
+    today_str = datetime.now().strftime('%Y-%m-%d')
+    prompt_parse = f"""
+다음 여행 계획을 분석하여 각 일정을 캘린더 이벤트로 변환해주세요:
+
+{plan_text}
+
+**중요: 날짜 변환 규칙**
+- 현재 날짜: {today_str}
+- 사용자가 지정한 시작 날짜: {user_specified_date or "계획에서 추출"}
+- "25년" = "2025년"으로 해석
+- 사용자가 "{input}"라고 했다면, 명시된 날짜를 정확히 사용
+- 모든 날짜는 정확히 YYYY-MM-DD 형식으로 변환
+- 시간대는 반드시 +09:00 (한국 시간) 사용
+
+각 일정마다 다음 형식으로 출력하세요:
+제목;시작시간;종료시간
+
+예시:
+경복궁 방문;2025-06-20T11:00:00+09:00;2025-06-20T12:30:00+09:00
+인사동 점심;2025-06-20T13:00:00+09:00;2025-06-20T14:00:00+09:00
+
+각 줄마다 하나의 이벤트만 작성하고, 다른 설명은 포함하지 마세요.
+날짜가 불명확한 경우 {user_specified_date or "2025-06-20"}부터 시작하세요.
+
+**응답은 반드시 일반 텍스트로만 제공하세요. JSON이나 특수 구조는 사용하지 마세요.**
+"""
+    return cached_generate(
+        prompt_parse,
+        tool="create_calendar_from_plan",
+        context={"today": today_str, "start_date": user_specified_date},
+        stream_output=False
+    )
+
+def prepare_plan_events(plan_version: dict, user_specified_date: str, input: str) -> tuple:
+    """
+    계획 버전을 캘린더 이벤트로 변환
+    반환값: (이벤트 목록, 오류 메시지 목록, LLM 보정 결과)
+    """
+    # 계획 생성 시점에 파싱해 둔 이벤트 사용 (시작 날짜를 바꾸면 다시 파싱해서 날짜 이동)
+    parsed = plan_version["parsed"]
+    if user_specified_date:
+        parsed = parse_plan(plan_version["content"], user_specified_date)
+
+    content = ""
+    fallback_lines = []
+    if not parsed.events:
+        # 정해진 형식을 전혀 따르지 않은 계획 → 전체를 LLM으로 변환
+        content = _llm_parse_events(plan_version["content"], user_specified_date, input)
+    elif parsed.unparsed:
+        # 해석하지 못한 줄만 LLM으로 보정
+        unparsed_text = "\n".join(
+            f"Day{day} ({date}): {line}" if date else line
+            for day, date, line in parsed.unparsed
+        )
+        content = _llm_parse_events(unparsed_text, user_specified_date, input)
+    if content:
+        if user_specified_date and user_specified_date not in content:
+            # Streamlit UI에서는 경고로 처리하지만, 여기서는 문자열로만 반환
+            content = f"⚠️ 사용자 지정 날짜({user_specified_date})가 반영되지 않았습니다.\n\n{content}"
+        fallback_lines = [
+            line.strip() for line in content.strip().split('\n')
+            if ';' in line and line.count(';') >= 2
+        ]
+
+    errors = []
+    plan_events = parsed.events
+    if fallback_lines:
+        event_lines = [to_event_line(event) for event in parsed.events] + fallback_lines
+        plan_events, errors = plan_events_from_lines(event_lines)
+    return plan_events, errors, content
+
+def _prefetch(plan_version: dict) -> PreparedBooking:
+    with trace_turn(intent="BOOK_PREFETCH", version=plan_version["version"]), calendar_priority(PRIORITY_BULK):
+        plan_events, errors, content = prepare_plan_events(plan_version, None, "")
+        existing, counts = None, {"insert": len(plan_events), "patch": 0, "delete": 0, "noop": 0}
+        if plan_events:
+            trip_key = make_trip_key(plan_events)
+            try:
+                existing = fetch_trip_events(trip_key)
+                counts = {kind: len(items) for kind, items in compute_diff(trip_key, plan_events, existing).items()}
+            except Exception:
+                # 조회 실패는 예약 작업이 다시 조회하므로 무시
+                existing = None
+        return PreparedBooking(plan_events, errors, content, existing, counts, time.monotonic())
+
+def start_booking_prefetch(plan_version: dict = None):
+    """새 계획 버전에 대한 사전 준비를 시작 (이전 계획의 준비 결과는 버림)"""
+    plan_version = plan_version or get_latest_plan_version()
+    # 형식대로 파싱된 일정이 없는 계획은 전체를 LLM 으로 변환해야 하므로 추측 실행하지 않음
+    if not BOOKING_PREFETCH or not plan_version or not plan_version["parsed"].events:
+        return
+    get_session_state()[SESSION_PREFETCH_KEY] = {
+        "version": plan_version["version"],
+        "content": plan_version["content"],
+        "start_date": plan_version["parsed"].start_date,
+        "future": _executor.submit(_prefetch, plan_version),
+    }
+
+def take_booking_prefetch(plan_version: dict, user_specified_date: str = None):
+    """
+    현재 계획과 시작 날짜에 맞는 사전 준비 결과를 꺼냄 (한 번만 사용, 없거나 맞지 않으면 None)
+    미리 조회한 캘린더 상태가 오래되었으면 이벤트 변환 결과만 사용합니다.
+    """
+    entry = get_session_state().pop(SESSION_PREFETCH_KEY, None)
+    if entry is None or entry["version"] != plan_version["version"] or entry["content"] != plan_version["content"]:
+        return None
+    # 다른 시작 날짜로 예약하면 날짜가 이동하므로 처음부터 다시 준비
+    if user_specified_date and user_specified_date != entry["start_date"]:
+        return None
+    try:
+        prepared = entry["future"].result(timeout=PREFETCH_WAIT)
+    except Exception:
+        return None
+    if time.monotonic() - prepared.fetched_at > PREFETCH_MAX_AGE:
+        prepared = prepared._replace(existing=None)
+    return prepared
@@ -0,0 +1,404 @@
+import os
+import re
+import time
+import heapq
+import queue
+import random
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from urllib.parse import unquote
+
+from googleapiclient.errors import HttpError
+
+import config
+from utils.tracing import span
+
+# ========================================
+# Calendar HTTP 전송 객체 풀
+# httplib2 는 스레드 안전하지 않으므로 요청마다 전송 객체를 하나씩 독점해서 사용합니다.
+# ========================================
+CALENDAR_HTTP_POOL_SIZE = int(os.getenv("CALENDAR_HTTP_POOL_SIZE", "8"))
+# 이 시간(초) 이상 쉬었던 전송 객체는 keep-alive 커넥션이 끊겼을 수 있으므로 연결을 새로 맺음
+CALENDAR_HTTP_MAX_IDLE = float(os.getenv("CALENDAR_HTTP_MAX_IDLE", "60"))
+# 풀이 모두 사용 중일 때 기다리는 최대 시간(초)
+CALENDAR_HTTP_ACQUIRE_TIMEOUT = float(os.getenv("CALENDAR_HTTP_ACQUIRE_TIMEOUT", "30"))
+
+class CalendarHttpPool:
+    """
+    크기가 제한된 AuthorizedHttp 풀
+    - 동시에 최대 size 개의 요청만 실행 (초과 요청은 반납될 때까지 대기)
+    - 오래 쉬었던 전송 객체는 빌려줄 때 커넥션을 정리 (상태 점검)
+    - 전송 오류(SSL/연결 끊김 등)가 난 객체는 버리고 다음에 새로 생성
+    - 토큰 갱신은 한 스레드만 수행하고 나머지는 갱신된 자격 증명을 공유
+    """
+
+    def __init__(self, size: int = CALENDAR_HTTP_POOL_SIZE, factory=None,
+                 max_idle: float = CALENDAR_HTTP_MAX_IDLE):
+        self.size = size
+        self.max_idle = max_idle
+        self._factory = factory or config.new_calendar_http
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._refresh_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"created": 0, "reset": 0, "discarded": 0, "in_use": 0}
+
+    def _count(self, key: str, delta: int = 1):
+        with self._stats_lock:
+            self._stats[key] += delta
+
+    def _ensure_fresh_credentials(self, authorized):
+        """만료된 토큰은 한 번만 갱신 (동시에 여러 스레드가 갱신 요청을 보내지 않도록)"""
+        credentials = getattr(authorized, "credentials", None)
+        if credentials is None or credentials.valid:
+            return
+        import google_auth_httplib2
+
+        with self._refresh_lock:
+            if not credentials.valid:
+                credentials.refresh(google_auth_httplib2.Request(authorized.http))
+
+    def _checkout(self):
+        if not self._slots.acquire(timeout=CALENDAR_HTTP_ACQUIRE_TIMEOUT):
+            raise TimeoutError("Calendar HTTP 풀에서 사용 가능한 연결을 기다리다 시간이 초과되었습니다.")
+        try:
+            try:
+                authorized, returned_at = self._idle.get_nowait()
+                if time.monotonic() - returned_at > self.max_idle:
+                    authorized.http.close()
+                    self._count("reset")
+            except queue.Empty:
+                authorized = self._factory()
+                self._count("created")
+            self._ensure_fresh_credentials(authorized)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._count("in_use")
+        return authorized
+
+    def _checkin(self, authorized, healthy: bool):
+        self._count("in_use", -1)
+        if healthy:
+            self._idle.put((authorized, time.monotonic()))
+        else:
+            self._count("discarded")
+            try:
+                authorized.http.close()
+            except Exception:
+                pass
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """요청 하나를 실행하는 동안 전송 객체를 독점"""
+        authorized = self._checkout()
+        healthy = True
+        try:
+            yield authorized
+        except HttpError:
+            # API 오류 응답은 연결 자체의 문제가 아님
+            raise
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self._checkin(authorized, healthy)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {**self._stats, "idle": self._idle.qsize(), "size": self.size}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_calendar_http_pool() -> CalendarHttpPool:
+    """프로세스 전역 Calendar HTTP 풀"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CalendarHttpPool()
+        return _pool
+
+# ========================================
+# 쿼터 기반 호출 속도 제한 (토큰 버킷 + 우선순위 + 적응형 백오프)
+# ========================================
+# 캘린더별 기본 한도 (초당 요청 수 / 순간 최대 요청 수)
+CALENDAR_RATE_LIMIT = float(os.getenv("CALENDAR_RATE_LIMIT", "10"))
+CALENDAR_RATE_BURST = float(os.getenv("CALENDAR_RATE_BURST", "10"))
+# 캘린더별 개별 한도: "캘린더ID=초당요청수[:순간최대],..."
+CALENDAR_RATE_LIMITS = os.getenv("CALENDAR_RATE_LIMITS", "")
+# 사용자(서비스 계정) 전체 한도 - 모든 캘린더 호출이 함께 사용
+CALENDAR_USER_RATE_LIMIT = float(os.getenv("CALENDAR_USER_RATE_LIMIT", "10"))
+CALENDAR_USER_RATE_BURST = float(os.getenv("CALENDAR_USER_RATE_BURST", "20"))
+# 속도 제한 오류(403 rateLimitExceeded / 429)를 받았을 때 같은 요청을 다시 보내는 최대 횟수
+CALENDAR_RATE_MAX_RETRIES = int(os.getenv("CALENDAR_RATE_MAX_RETRIES", "5"))
+# 토큰을 기다리는 최대 시간(초)
+CALENDAR_RATE_MAX_WAIT = float(os.getenv("CALENDAR_RATE_MAX_WAIT", "60"))
+
+RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+USER_BUCKET = "__user__"
+
+# 우선순위 (작을수록 먼저): 화면 조회 → 대화 중 변경 → 백그라운드 대량 예약
+PRIORITY_READ, PRIORITY_WRITE, PRIORITY_BULK = 0, 1, 2
+READ_OPERATIONS = ("events.list", "events.get")
+_priority = contextvars.ContextVar("calendar_priority", default=None)
+
+@contextmanager
+def calendar_priority(priority: int):
+    """이 블록 안의 Calendar 호출 우선순위 지정 (예: 백그라운드 예약 작업은 PRIORITY_BULK)"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def is_rate_limit_error(error) -> bool:
+    """429 또는 403 rateLimitExceeded/userRateLimitExceeded 인지 확인"""
+    status = getattr(getattr(error, "resp", None), "status", None)
+    if status == 429:
+        return True
+    return status == 403 and any(reason in str(error) for reason in RATE_LIMIT_REASONS)
+
+def _parse_rate_limits(text: str) -> dict:
+    limits = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        calendar_id, _, value = item.rpartition("=")
+        rate, _, burst = value.partition(":")
+        limits[calendar_id.strip()] = (float(rate), float(burst or rate))
+    return limits
+
+class TokenBucket:
+    """
+    초당 rate 개씩 채워지고 최대 burst 개까지 쌓이는 토큰 버킷
+    속도 제한 오류를 받으면 속도를 절반으로 줄이고 잠시 멈추며(지수 백오프),
+    성공할 때마다 설정된 속도까지 조금씩 다시 올립니다 (AIMD).
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.backoff = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float, now: float) -> float:
+        """cost 개의 토큰을 쓰려면 기다려야 하는 시간(초)"""
+        self._refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        # burst 보다 큰 batch 는 버킷이 가득 차면 보내고 부족분은 이후 요청이 기다림
+        need = min(cost, self.burst)
+        return 0.0 if self.tokens >= need else (need - self.tokens) / self.rate
+
+    def take(self, cost: float):
+        self.tokens -= cost
+
+    def on_rate_limited(self, now: float):
+        # 이미 멈춰 있는 동안 도착한 오류는 같은 혼잡에 대한 것이므로 한 번만 감속
+        if now < self.paused_until:
+            return
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        self.backoff = min(max(self.backoff * 2, 1.0), 32.0)
+        self.paused_until = max(self.paused_until, now + self.backoff * random.uniform(0.5, 1.0))
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+        self.backoff /= 2
+
+class CalendarRateLimiter:
+    """
+    프로세스 전역 Calendar 호출 스케줄러
+    캘린더별 버킷과 사용자 전체 버킷에서 모두 토큰을 얻어야 호출할 수 있으며,
+    대기 중인 요청은 우선순위(같으면 도착 순서)대로 처리합니다.
+    """
+
+    def __init__(self, default_limit: tuple = (CALENDAR_RATE_LIMIT, CALENDAR_RATE_BURST),
+                 user_limit: tuple = (CALENDAR_USER_RATE_LIMIT, CALENDAR_USER_RATE_BURST),
+                 calendar_limits: dict = None):
+        self.default_limit = default_limit
+        self.calendar_limits = _parse_rate_limits(CALENDAR_RATE_LIMITS) if calendar_limits is None else calendar_limits
+        self._buckets = {USER_BUCKET: TokenBucket(*user_limit)}
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._tickets = itertools.count()
+        self._stats = {"acquired": 0, "waited_seconds": 0.0, "rate_limited": 0}
+
+    def _bucket(self, calendar_id: str) -> TokenBucket:
+        if calendar_id not in self._buckets:
+            self._buckets[calendar_id] = TokenBucket(*self.calendar_limits.get(calendar_id, self.default_limit))
+        return self._buckets[calendar_id]
+
+    def acquire(self, calendar_id: str, cost: float = 1, priority: int = PRIORITY_WRITE,
+                timeout: float = CALENDAR_RATE_MAX_WAIT):
+        started = time.monotonic()
+        # 대기 시간은 깨어날 때마다가 아니라 처음 호출한 시점부터 합산
+        deadline = started + timeout
+        with self._cond:
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._waiting[0] == ticket:
+                        buckets = (self._bucket(calendar_id), self._buckets[USER_BUCKET])
+                        wait = max(bucket.wait_time(cost, now) for bucket in buckets)
+                        if wait <= 0:
+                            for bucket in buckets:
+                                bucket.take(cost)
+                            self._stats["acquired"] += 1
+                            self._stats["waited_seconds"] += now - started
+                            return
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise TimeoutError("Calendar API 호출 한도 대기 시간이 초과되었습니다.")
+                    # 맨 앞 요청이 아니면 앞 요청이 토큰을 가져갈 때까지 대기
+                    self._cond.wait(min(wait, remaining) if wait is not None else remaining)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def report(self, calendar_id: str, rate_limited: bool):
+        """호출 결과를 반영해 속도 조절 (속도 제한 오류 → 감속, 성공 → 점진적 회복)"""
+        with self._cond:
+            now = time.monotonic()
+            for bucket in (self._bucket(calendar_id), self._buckets[USER_BUCKET]):
+                if rate_limited:
+                    bucket.on_rate_limited(now)
+                else:
+                    bucket.on_success()
+            if rate_limited:
+                self._stats["rate_limited"] += 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "rates": {key: round(bucket.rate, 2) for key, bucket in self._buckets.items()},
+            }
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> CalendarRateLimiter:
+    """프로세스 전역 Calendar 호출 스케줄러"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = CalendarRateLimiter()
+        return _limiter
+
+def _calendar_of(request) -> str:
+    match = re.search(r"/calendars/([^/?]+)", getattr(request, "uri", "") or "")
+    return unquote(match.group(1)) if match else config.CALENDAR_ID
+
+# ========================================
+# Calendar API 호출 공통 실행 지점
+# 모든 요청이 이곳을 거치므로 추적과 호출 속도 제어를 한 곳에서 처리합니다.
+# ========================================
+def execute_request(request, operation: str, priority: int = None):
+    """
+    googleapiclient HttpRequest 실행
+    호출 한도 토큰을 얻은 뒤 풀에서 빌린 전송 객체로 실행하고, 속도 제한 오류는 감속 후 다시 시도합니다.
+    """
+    calendar_id = _calendar_of(request)
+    if priority is None:
+        priority = _priority.get()
+    if priority is None:
+        priority = PRIORITY_READ if operation in READ_OPERATIONS else PRIORITY_WRITE
+    limiter = get_rate_limiter()
+
+    for attempt in range(CALENDAR_RATE_MAX_RETRIES + 1):
+        limiter.acquire(calendar_id, 1, priority)
+        try:
+            with span("calendar", operation, attempt=attempt) as info, get_calendar_http_pool().connection() as http:
+                result = request.execute(http=http)
+                if isinstance(result, dict) and "items" in result:
+                    info["items"] = len(result["items"])
+        except HttpError as e:
+            if is_rate_limit_error(e):
+                limiter.report(calendar_id, rate_limited=True)
+                if attempt < CALENDAR_RATE_MAX_RETRIES:
+                    continue
+            raise
+        limiter.report(calendar_id, rate_limited=False)
+        return result
+
+def execute_batch_request(batch, size: int, calendar_id: str = None, priority: int = None):
+    """
+    BatchHttpRequest 실행 (하위 요청 수만큼 호출 한도 토큰 사용)
+    하위 요청의 속도 제한 오류는 호출 측(execute_batch)이 report_batch_outcome() 으로 알려줍니다.
+    """
+    if priority is None:
+        priority = _priority.get()
+    if priority is None:
+        priority = PRIORITY_WRITE
+    get_rate_limiter().acquire(calendar_id or config.CALENDAR_ID, size, priority)
+    with span("calendar", "batch", requests=size), get_calendar_http_pool().connection() as http:
+        batch.execute(http=http)
+
+def report_batch_outcome(errors: list, calendar_id: str = None):
+    """batch 하위 요청 결과를 호출 속도 조절에 반영"""
+    rate_limited = any(error is not None and is_rate_limit_error(error) for error in errors)
+    get_rate_limiter().report(calendar_id or config.CALENDAR_ID, rate_limited)
+
+# ========================================
+# 이벤트 목록 조회 (페이지 단위 지연 조회 + 필드 제한)
+# ========================================
+# 목록 표시와 존재 확인에 필요한 필드만 요청 (설명/참석자/링크 등은 받지 않음)
+EVENT_LIST_FIELDS = "id,summary,start,end,status"
+EVENT_PAGE_SIZE = int(os.getenv("CALENDAR_EVENT_PAGE_SIZE", "250"))
+
+def list_fields(item_fields: str = EVENT_LIST_FIELDS, sync: bool = False) -> str:
+    """events.list 의 fields 파라미터 (페이지/동기화 토큰 + 이벤트별 필드)"""
+    return ("nextPageToken,nextSyncToken" if sync else "nextPageToken") + f",items({item_fields})"
+
+def iter_event_pages(calendar_id: str = None, item_fields: str = EVENT_LIST_FIELDS, sync: bool = False, **params):
+    """events.list 결과를 pageToken 으로 한 페이지씩 지연 조회"""
+    page_token = None
+    while True:
+        page = execute_request(config.get_calendar_service().events().list(
+            calendarId=calendar_id or config.CALENDAR_ID,
+            singleEvents=True,
+            fields=list_fields(item_fields, sync),
+            pageToken=page_token,
+            **params
+        ), "events.list")
+        yield page
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return
+
+def iter_events(time_min: str = None, time_max: str = None, query: str = None, limit: int = None,
+                calendar_id: str = None, item_fields: str = EVENT_LIST_FIELDS):
+    """
+    기간(time_min ~ time_max, RFC3339)과 검색어로 이벤트를 시작 시간 순으로 하나씩 반환
+    limit 개를 채우면 다음 페이지는 요청하지 않습니다.
+    """
+    params = {"orderBy": "startTime", "maxResults": min(limit or EVENT_PAGE_SIZE, EVENT_PAGE_SIZE)}
+    if time_min:
+        params["timeMin"] = time_min
+    if time_max:
+        params["timeMax"] = time_max
+    if query:
+        params["q"] = query
+
+    count = 0
+    for page in iter_event_pages(calendar_id, item_fields, **params):
+        for event in page.get("items", []):
+            yield event
+            count += 1
+            if limit is not None and count >= limit:
+                return
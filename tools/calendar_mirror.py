@@ -0,0 +1,146 @@
+import os
+import time
+import threading
+from datetime import datetime, timezone, timedelta
+
+from googleapiclient.errors import HttpError
+
+from config import CALENDAR_ID
+from tools.calendar_api import iter_event_pages
+
+KST = timezone(timedelta(hours=9))
+
+# 미러가 이 시간(초)보다 오래되면 조회 전에 증분 동기화를 수행합니다.
+MIRROR_MAX_AGE = float(os.getenv("CALENDAR_MIRROR_MAX_AGE", "30"))
+
+def _event_date(event: dict) -> str:
+    start = event.get("start", {})
+    return (start.get("dateTime") or start.get("date") or "")[:10]
+
+def _event_time(event: dict, field: str = "start") -> datetime:
+    value = event.get(field, {})
+    if value.get("dateTime"):
+        return datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
+    return datetime.fromisoformat(value.get("date", "1970-01-01")).replace(tzinfo=KST)
+
+class CalendarMirror:
+    """
+    CALENDAR_ID의 로컬(메모리) 미러
+    - (날짜, 제목) 인덱스로 존재 여부를 네트워크 없이 확인
+    - syncToken 기반 증분 동기화로 변경분만 가져옴
+    - 토큰이 만료(410 Gone)되면 전체 재동기화
+    """
+
+    def __init__(self, calendar_id: str, max_age: float = MIRROR_MAX_AGE):
+        self.calendar_id = calendar_id
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._events = {}
+        self._index = {}
+        self._sync_token = None
+        self._synced_at = 0.0
+
+    # ----------------------------------------
+    # 인덱스 관리
+    # ----------------------------------------
+    def _index_key(self, event: dict) -> tuple:
+        return (_event_date(event), event.get("summary", "").strip())
+
+    def _discard(self, event_id: str):
+        old = self._events.pop(event_id, None)
+        if old is not None:
+            ids = self._index.get(self._index_key(old))
+            if ids:
+                ids.discard(event_id)
+                if not ids:
+                    del self._index[self._index_key(old)]
+
+    def apply(self, event: dict):
+        """이벤트 추가/갱신 (API 응답을 그대로 반영, 취소된 이벤트는 제거)"""
+        if not event or "id" not in event:
+            return
+        with self._lock:
+            self._discard(event["id"])
+            if event.get("status") == "cancelled":
+                return
+            self._events[event["id"]] = event
+            self._index.setdefault(self._index_key(event), set()).add(event["id"])
+
+    def remove(self, event_id: str):
+        with self._lock:
+            self._discard(event_id)
+
+    # ----------------------------------------
+    # 동기화
+    # ----------------------------------------
+    def _list_pages(self, **params):
+        # 조회/존재 확인에 필요한 필드와 syncToken 만 받음
+        return iter_event_pages(self.calendar_id, sync=True, **params)
+
+    def _full_sync(self):
+        self._events = {}
+        self._index = {}
+        self._sync_token = None
+        for page in self._list_pages():
+            for event in page.get("items", []):
+                self.apply(event)
+            self._sync_token = page.get("nextSyncToken", self._sync_token)
+
+    def _incremental_sync(self):
+        for page in self._list_pages(syncToken=self._sync_token, showDeleted=True):
+            for event in page.get("items", []):
+                self.apply(event)
+            self._sync_token = page.get("nextSyncToken", self._sync_token)
+
+    def refresh(self, force: bool = False):
+        """필요할 때만 동기화 (처음에는 전체, 이후에는 증분)"""
+        with self._lock:
+            if not force and self._sync_token and time.monotonic() - self._synced_at < self.max_age:
+                return
+            if self._sync_token is None:
+                self._full_sync()
+            else:
+                try:
+                    self._incremental_sync()
+                except HttpError as e:
+                    if getattr(e.resp, "status", None) != 410:
+                        raise
+                    # syncToken이 무효화됨 → 전체 재동기화
+                    self._full_sync()
+            self._synced_at = time.monotonic()
+
+    def invalidate(self):
+        """다음 조회 때 증분 동기화를 강제"""
+        with self._lock:
+            self._synced_at = 0.0
+
+    # ----------------------------------------
+    # 조회
+    # ----------------------------------------
+    def find(self, date: str, summary: str):
+        """(날짜, 제목)이 같은 이벤트를 반환 (없으면 None)"""
+        self.refresh()
+        with self._lock:
+            ids = self._index.get((date, summary.strip()))
+            if not ids:
+                return None
+            return self._events[sorted(ids)[0]]
+
+    def upcoming(self, time_min: datetime, limit: int = 10) -> list:
+        """time_min 이후에 끝나는 이벤트를 시작 시간 순으로 반환 (events.list의 timeMin과 동일)"""
+        self.refresh()
+        with self._lock:
+            events = [e for e in self._events.values() if _event_time(e, "end") > time_min]
+        events.sort(key=_event_time)
+        return events[:limit]
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+def get_calendar_mirror() -> CalendarMirror:
+    """프로세스 전역 캘린더 미러"""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = CalendarMirror(CALENDAR_ID)
+        return _mirror
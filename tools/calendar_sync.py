@@ -0,0 +1,218 @@
+import hashlib
+from datetime import datetime
+
+from config import get_calendar_service, CALENDAR_ID
+from tools.calendar_api import iter_event_pages
+from utils.utils import validate_date_format
+from utils.plan_parser import PlanEvent
+from tools.calendar_mirror import get_calendar_mirror
+from tools.calendar_tools import (
+    execute_batch,
+    build_event_body,
+    format_created_message
+)
+
+# ========================================
+# 1) 결정적 이벤트 ID
+# ========================================
+# extendedProperties.private 에 저장되는 키 (이 값으로 여행별 이벤트를 서버에서 필터링)
+TRIP_PROPERTY = "travelPlannerTrip"
+SLOT_PROPERTY = "travelPlannerSlot"
+
+def make_trip_key(plan_events: list) -> str:
+    """여행 키: 계획의 시작 날짜 (같은 시작일의 계획을 다시 예약하면 같은 여행으로 간주)"""
+    return min(event.start for event in plan_events).split("T")[0]
+
+def make_event_id(trip_key: str, day: int, slot: int) -> str:
+    """
+    (여행, 일차, 순번)으로부터 안정적인 이벤트 ID 생성
+    Calendar 이벤트 ID는 base32hex 문자(0-9, a-v)만 허용하므로 hex digest를 사용합니다.
+    """
+    digest = hashlib.sha1(f"{CALENDAR_ID}|{trip_key}|{day}|{slot}".encode("utf-8")).hexdigest()
+    return f"tp{digest[:30]}"
+
+def plan_events_from_lines(event_lines: list) -> tuple:
+    """
+    "제목;시작시간;종료시간" 목록을 일차/순번이 붙은 PlanEvent 목록으로 변환
+    반환값: (이벤트 목록, 실패 메시지 목록)
+    """
+    parsed = []
+    errors = []
+    for line in event_lines:
+        try:
+            summary, start, end = [x.strip() for x in line.split(";")]
+        except ValueError:
+            errors.append(f"❌ 일정 등록에 실패했습니다: 잘못된 입력 형식입니다 ({line})")
+            continue
+        if not validate_date_format(start) or not validate_date_format(end):
+            errors.append(f"❌ 잘못된 날짜 형식입니다: {start}, {end}")
+            continue
+        parsed.append((summary, start, end))
+
+    if not parsed:
+        return [], errors
+
+    parsed.sort(key=lambda event: event[1])
+    first_date = datetime.fromisoformat(parsed[0][1].split("T")[0])
+    slots = {}
+    plan_events = []
+    for summary, start, end in parsed:
+        day = (datetime.fromisoformat(start.split("T")[0]) - first_date).days + 1
+        slots[day] = slots.get(day, 0) + 1
+        plan_events.append(PlanEvent(summary, start, end, day, slots[day]))
+    return plan_events, errors
+
+# ========================================
+# 2) 캘린더 조회 및 diff 계산
+# ========================================
+def fetch_trip_events(trip_key: str) -> dict:
+    """
+    여행에 속한 이벤트를 한 번의 events.list로 조회 (삭제된 이벤트 포함)
+    종료 시각은 열어두어, 계획이 짧아진 경우 남은 뒷날 일정도 정리할 수 있게 합니다.
+    """
+    existing = {}
+    # diff 계산에 필요한 필드(id/status/summary/start/end)만 요청
+    for page in iter_event_pages(
+        timeMin=f"{trip_key}T00:00:00+09:00",
+        privateExtendedProperty=f"{TRIP_PROPERTY}={trip_key}",
+        showDeleted=True
+    ):
+        for event in page.get("items", []):
+            existing[event["id"]] = event
+    return existing
+
+def _same_time(a: dict, b: str) -> bool:
+    value = (a or {}).get("dateTime")
+    if not value:
+        return False
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) == datetime.fromisoformat(b)
+
+def _needs_patch(current: dict, desired: dict) -> bool:
+    return (
+        current.get("status") == "cancelled"
+        or current.get("summary", "").strip() != desired.summary
+        or not _same_time(current.get("start"), desired.start)
+        or not _same_time(current.get("end"), desired.end)
+    )
+
+def compute_diff(trip_key: str, plan_events: list, existing: dict) -> dict:
+    """
+    원하는 이벤트와 캘린더의 현재 상태를 비교하여 insert/patch/delete/noop 로 분류
+    """
+    diff = {"insert": [], "patch": [], "delete": [], "noop": []}
+    desired_ids = set()
+    for event in plan_events:
+        event_id = make_event_id(trip_key, event.day, event.slot)
+        desired_ids.add(event_id)
+        body = build_event_body(event.summary, event.start, event.end)
+        body["id"] = event_id
+        body["status"] = "confirmed"
+        body["extendedProperties"] = {"private": {
+            TRIP_PROPERTY: trip_key,
+            SLOT_PROPERTY: f"{event.day}-{event.slot}"
+        }}
+        current = existing.get(event_id)
+        if current is None:
+            diff["insert"].append((event, body))
+        elif _needs_patch(current, event):
+            diff["patch"].append((event, body))
+        else:
+            diff["noop"].append((event, body))
+
+    for event_id, current in existing.items():
+        if event_id not in desired_ids and current.get("status") != "cancelled":
+            diff["delete"].append(current)
+    return diff
+
+# ========================================
+# 3) 필요한 변경만 적용
+# ========================================
+def apply_diff_outcomes(diff: dict) -> list:
+    """
+    diff에 포함된 변경만 batch 요청으로 전송하고 이벤트별 결과를 반환
+    반환값: [(이벤트 ID, 동작, 성공 여부, 메시지)] - insert, patch, delete, noop 순서
+    """
+    factories = {}
+    for _, body in diff["insert"]:
+        factories[f"insert:{body['id']}"] = (
+            lambda b=body: get_calendar_service().events().insert(calendarId=CALENDAR_ID, body=b)
+        )
+    for _, body in diff["patch"]:
+        factories[f"patch:{body['id']}"] = (
+            lambda b=body: get_calendar_service().events().patch(calendarId=CALENDAR_ID, eventId=b["id"], body=b)
+        )
+    for current in diff["delete"]:
+        factories[f"delete:{current['id']}"] = (
+            lambda eid=current["id"]: get_calendar_service().events().delete(calendarId=CALENDAR_ID, eventId=eid)
+        )
+    results = execute_batch(factories) if factories else {}
+
+    # 이미 존재하는 ID(409)로 insert가 거절된 경우 patch로 한 번 더 시도
+    conflicts = {
+        body["id"]: body for _, body in diff["insert"]
+        if getattr(getattr(results[f"insert:{body['id']}"][1], "resp", None), "status", None) == 409
+    }
+    if conflicts:
+        retried = execute_batch({
+            event_id: (lambda b=body: get_calendar_service().events().patch(calendarId=CALENDAR_ID, eventId=b["id"], body=b))
+            for event_id, body in conflicts.items()
+        })
+        for event_id, outcome in retried.items():
+            results[f"insert:{event_id}"] = outcome
+
+    # 성공한 변경은 로컬 미러에도 바로 반영
+    mirror = get_calendar_mirror()
+    for key, (response, error) in results.items():
+        if error is not None:
+            continue
+        if key.startswith("delete:"):
+            mirror.remove(key.split(":", 1)[1])
+        else:
+            mirror.apply(response)
+
+    outcomes = []
+    for event, body in diff["insert"]:
+        _, error = results[f"insert:{body['id']}"]
+        if error is not None:
+            outcomes.append((body["id"], "insert", False, f"❌ '{event.summary}' 일정 등록에 실패했습니다: {error}"))
+        else:
+            outcomes.append((body["id"], "insert", True, format_created_message(event.summary, event.start, event.end)))
+    for event, body in diff["patch"]:
+        _, error = results[f"patch:{body['id']}"]
+        if error is not None:
+            outcomes.append((body["id"], "patch", False, f"❌ '{event.summary}' 일정 수정에 실패했습니다: {error}"))
+        else:
+            outcomes.append((body["id"], "patch", True, f"✏️ '{event.summary}' 일정이 변경된 계획에 맞게 수정되었습니다."))
+    for current in diff["delete"]:
+        _, error = results[f"delete:{current['id']}"]
+        summary = current.get("summary", "제목 없음")
+        if error is not None:
+            outcomes.append((current["id"], "delete", False, f"❌ '{summary}' 일정 삭제에 실패했습니다: {error}"))
+        else:
+            outcomes.append((current["id"], "delete", True, f"🗑️ 계획에서 빠진 '{summary}' 일정을 삭제했습니다."))
+    for event, body in diff["noop"]:
+        outcomes.append((body["id"], "noop", True, f"✔️ '{event.summary}' 일정은 이미 최신 상태입니다."))
+    return outcomes
+
+def apply_diff(diff: dict) -> list:
+    """diff에 포함된 변경만 batch 요청으로 전송하고 이벤트별 결과 메시지를 반환"""
+    return [message for _, _, _, message in apply_diff_outcomes(diff)]
+
+def sync_events_to_calendar(plan_events: list) -> list:
+    """
+    PlanEvent 목록을 캘린더와 동기화합니다.
+    변경이 없는 계획을 다시 예약하면 조회 1회, 쓰기 0회로 끝납니다.
+    """
+    if not plan_events:
+        return []
+    trip_key = make_trip_key(plan_events)
+    existing = fetch_trip_events(trip_key)
+    diff = compute_diff(trip_key, plan_events, existing)
+    return apply_diff(diff)
+
+def sync_plan_to_calendar(event_lines: list) -> list:
+    """
+    "제목;시작시간;종료시간" 목록으로 표현된 여행 계획을 캘린더와 동기화합니다.
+    """
+    plan_events, messages = plan_events_from_lines(event_lines)
+    return messages + sync_events_to_calendar(plan_events)
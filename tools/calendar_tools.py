@@ -1,9 +1,48 @@
-from datetime import datetime, timezone, timedelta
-import streamlit as st
+import os
+import time
+import random
+from datetime import datetime, timedelta
 
-from langchain.tools import tool
-from config import service, CALENDAR_ID
+from langchain_core.tools import tool
+from config import get_calendar_service, CALENDAR_ID
+from tools.calendar_api import (
+    execute_request,
+    execute_batch_request,
+    report_batch_outcome,
+    is_rate_limit_error,
+    iter_events
+)
 from utils.utils import validate_date_format
+from tools.calendar_mirror import get_calendar_mirror, KST
+
+# ========================================
+# 배치 요청 설정
+# ========================================
+# Calendar API는 batch 하나당 최대 50개 요청을 권장합니다.
+BATCH_CHUNK_SIZE = 50
+BATCH_MAX_RETRIES = 3
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# ========================================
+# 일정 조회 설정
+# ========================================
+# 조건 없이 조회할 때 / 기간을 지정해 조회할 때 보여줄 최대 일정 수
+LIST_DEFAULT_LIMIT = 10
+LIST_MAX_EVENTS = int(os.getenv("CALENDAR_LIST_MAX_EVENTS", "200"))
+
+def build_event_body(summary: str, start: str, end: str) -> dict:
+    """캘린더 이벤트 리소스 생성"""
+    return {
+        'summary': summary,
+        'start': {'dateTime': start, 'timeZone': 'Asia/Seoul'},
+        'end': {'dateTime': end, 'timeZone': 'Asia/Seoul'}
+    }
+
+def format_created_message(summary: str, start: str, end: str) -> str:
+    """일정 등록 성공 메시지"""
+    start_time = datetime.fromisoformat(start.replace('+09:00', '')).strftime('%m월 %d일 %H:%M')
+    end_time = datetime.fromisoformat(end.replace('+09:00', '')).strftime('%H:%M')
+    return f"✅ '{summary}' 일정이 {start_time}~{end_time}에 성공적으로 등록되었습니다!"
 
 @tool
 def check_event_exists(input: str) -> str:
@@ -13,19 +52,10 @@ def check_event_exists(input: str) -> str:
     """
     try:
         summary, date = [x.strip() for x in input.split(";")]
-        start_date = f"{date}T00:00:00+09:00"
-        end_date = f"{date}T23:59:59+09:00"
-        events_result = service.events().list(
-            calendarId=CALENDAR_ID,
-            timeMin=start_date,
-            timeMax=end_date,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        events = events_result.get('items', [])
-        for event in events:
-            if event.get('summary', '').strip() == summary.strip():
-                return f"EXISTS:{event.get('id')}:{event.get('summary')}"
+        # 로컬 미러에서 조회 (변경분만 syncToken으로 동기화)
+        event = get_calendar_mirror().find(date, summary)
+        if event is not None:
+            return f"EXISTS:{event.get('id')}:{event.get('summary')}"
         return "NOT_EXISTS"
     except Exception as e:
         return f"ERROR: {e}"
@@ -41,53 +71,76 @@ def create_event_tool(input: str) -> str:
         if not validate_date_format(start) or not validate_date_format(end):
             return f"❌ 잘못된 날짜 형식입니다: {start}, {end}"
 
+        notes = []
         date_part = start.split('T')[0]
         check_result = check_event_exists(f"{summary};{date_part}")
         if check_result.startswith("EXISTS:"):
             event_id = check_result.split(":")[1]
             try:
-                service.events().delete(calendarId=CALENDAR_ID, eventId=event_id).execute()
-                st.write(f"🔄 기존 '{summary}' 일정을 삭제했습니다.")
+                execute_request(
+                    get_calendar_service().events().delete(calendarId=CALENDAR_ID, eventId=event_id),
+                    "events.delete"
+                )
+                get_calendar_mirror().remove(event_id)
+                notes.append(f"🔄 기존 '{summary}' 일정을 삭제했습니다.")
             except Exception as delete_error:
-                st.write(f"⚠️ 기존 일정 삭제 실패: {delete_error}")
-
-        event = {
-            'summary': summary,
-            'start': {'dateTime': start, 'timeZone': 'Asia/Seoul'},
-            'end': {'dateTime': end, 'timeZone': 'Asia/Seoul'}
-        }
-        created = service.events().insert(calendarId=CALENDAR_ID, body=event).execute()
-
-        start_time = datetime.fromisoformat(start.replace('+09:00', '')).strftime('%m월 %d일 %H:%M')
-        end_time = datetime.fromisoformat(end.replace('+09:00', '')).strftime('%H:%M')
-        return f"✅ '{summary}' 일정이 {start_time}~{end_time}에 성공적으로 등록되었습니다!"
+                notes.append(f"⚠️ 기존 일정 삭제 실패: {delete_error}")
+
+        event = build_event_body(summary, start, end)
+        created = execute_request(
+            get_calendar_service().events().insert(calendarId=CALENDAR_ID, body=event),
+            "events.insert"
+        )
+        get_calendar_mirror().apply(created)
+        # 화면에 직접 쓰지 않고 결과 메시지에 포함 (Streamlit 밖에서도 동작)
+        return "\n".join(notes + [format_created_message(summary, start, end)])
     except Exception as e:
         return f"❌ 일정 등록에 실패했습니다: {str(e)}"
 
+def _day_start(date_text: str) -> str:
+    """YYYY-MM-DD → 그날 00:00 (KST) RFC3339"""
+    return datetime.fromisoformat(date_text).replace(tzinfo=KST).isoformat()
+
+def format_event_line(event: dict) -> str:
+    start = event['start'].get('dateTime', event['start'].get('date'))
+    return f"{start} - {event.get('summary', '제목 없음')} (ID: {event.get('id', '')})"
+
 @tool
 def list_events_tool(input: str = "") -> str:
     """
-    오늘 이후의 일정을 최대 10개까지 조회합니다.
+    일정을 조회합니다. 입력 형식: 시작일(YYYY-MM-DD); 종료일(YYYY-MM-DD); 검색어 (모두 생략 가능)
+    입력이 없으면 오늘 이후 일정을 최대 10개, 종료일을 주면 기간 안의 일정을 모두 조회합니다.
     """
     try:
-        now = datetime.now(timezone(timedelta(hours=9))).isoformat()
-        events_result = service.events().list(
-            calendarId=CALENDAR_ID,
-            timeMin=now,
-            maxResults=10,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        events = events_result.get('items', [])
-        if not events:
-            return "예정된 일정이 없습니다."
-        event_list = []
-        for event in events:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            summary = event.get('summary', '제목 없음')
-            event_id = event.get('id', '')
-            event_list.append(f"{start} - {summary} (ID: {event_id})")
-        return "\n".join(event_list)
+        parts = [x.strip() for x in (input or "").split(";")] + ["", "", ""]
+        start_date, end_date, query = parts[:3]
+        now = datetime.now(KST)
+
+        if not (start_date or end_date or query):
+            # 조건 없는 기본 조회는 로컬 미러에서 처리 (네트워크 없음)
+            events = get_calendar_mirror().upcoming(now, limit=LIST_DEFAULT_LIMIT)
+            if not events:
+                return "예정된 일정이 없습니다."
+            return "\n".join(format_event_line(event) for event in events)
+
+        for value in (start_date, end_date):
+            if value and not validate_date_format(value):
+                return f"❌ 잘못된 날짜 형식입니다: {value} (YYYY-MM-DD)"
+        time_min = _day_start(start_date) if start_date else now.isoformat()
+        # 종료일 당일 일정까지 포함
+        time_max = (
+            (datetime.fromisoformat(end_date) + timedelta(days=1)).replace(tzinfo=KST).isoformat()
+            if end_date else None
+        )
+        limit = LIST_MAX_EVENTS if end_date else LIST_DEFAULT_LIMIT
+
+        # limit + 1 개까지만 페이지를 받아 잘렸는지 확인
+        lines = [format_event_line(event) for event in iter_events(time_min, time_max, query or None, limit + 1)]
+        if not lines:
+            return "조건에 맞는 일정이 없습니다."
+        if len(lines) > limit:
+            lines = lines[:limit] + [f"… 이후 일정이 더 있습니다 (최대 {limit}개 표시)"]
+        return "\n".join(lines)
     except Exception as e:
         return f"일정 조회 실패: {e}"
 
@@ -98,11 +151,18 @@ def update_event_tool(input: str) -> str:
     """
     try:
         event_id, new_summary, new_start, new_end = [x.strip() for x in input.split(";")]
-        event = service.events().get(calendarId=CALENDAR_ID, eventId=event_id).execute()
+        event = execute_request(
+            get_calendar_service().events().get(calendarId=CALENDAR_ID, eventId=event_id),
+            "events.get"
+        )
         event['summary'] = new_summary
         event['start'] = {'dateTime': new_start, 'timeZone': 'Asia/Seoul'}
         event['end'] = {'dateTime': new_end, 'timeZone': 'Asia/Seoul'}
-        updated = service.events().update(calendarId=CALENDAR_ID, eventId=event_id, body=event).execute()
+        updated = execute_request(
+            get_calendar_service().events().update(calendarId=CALENDAR_ID, eventId=event_id, body=event),
+            "events.update"
+        )
+        get_calendar_mirror().apply(updated)
         return f"✅ '{new_summary}' 일정이 성공적으로 수정되었습니다!"
     except Exception as e:
         return f"❌ 일정 수정에 실패했습니다: {str(e)}"
@@ -114,7 +174,67 @@ def delete_event_tool(input: str) -> str:
     """
     try:
         event_id = input.strip()
-        service.events().delete(calendarId=CALENDAR_ID, eventId=event_id).execute()
+        execute_request(
+            get_calendar_service().events().delete(calendarId=CALENDAR_ID, eventId=event_id),
+            "events.delete"
+        )
+        get_calendar_mirror().remove(event_id)
         return "✅ 일정이 성공적으로 삭제되었습니다!"
     except Exception as e:
-        return f"❌ 일정 삭제에 실패했습니다: {str(e)}"
\ No newline at end of file
+        return f"❌ 일정 삭제에 실패했습니다: {str(e)}"
+
+# ========================================
+# 배치 실행 헬퍼
+# ========================================
+def _is_retryable_error(error) -> bool:
+    """재시도할 가치가 있는 오류인지 확인 (429/5xx/403 rateLimit, 전송 오류)"""
+    resp = getattr(error, "resp", None)
+    if resp is None:
+        # HttpError가 아닌 경우(연결 끊김 등)는 전송 오류로 보고 재시도
+        return True
+    return getattr(resp, "status", None) in RETRYABLE_STATUS or is_rate_limit_error(error)
+
+def execute_batch(request_factories: dict, chunk_size: int = BATCH_CHUNK_SIZE,
+                  max_retries: int = BATCH_MAX_RETRIES) -> dict:
+    """
+    여러 Calendar API 요청을 batch 요청으로 묶어 실행합니다.
+    request_factories: {키: HttpRequest를 만드는 함수}
+    반환값: {키: (응답, 오류)} - 실패한 하위 요청만 골라 재시도합니다.
+    """
+    results = {}
+    pending = list(request_factories.keys())
+
+    for attempt in range(max_retries + 1):
+        if not pending:
+            break
+        if attempt > 0:
+            # 지터가 섞인 지수 백오프
+            time.sleep(min(0.5 * (2 ** (attempt - 1)), 8) + random.uniform(0, 0.5))
+
+        failed = []
+        for i in range(0, len(pending), chunk_size):
+            chunk = pending[i:i + chunk_size]
+
+            def _callback(request_id, response, exception, _chunk=chunk):
+                key = _chunk[int(request_id)]
+                results[key] = (response, exception)
+
+            batch = get_calendar_service().new_batch_http_request(callback=_callback)
+            for idx, key in enumerate(chunk):
+                batch.add(request_factories[key](), request_id=str(idx))
+            try:
+                execute_batch_request(batch, len(chunk))
+            except Exception as e:
+                # batch 전체가 실패하면 해당 청크의 모든 요청을 실패로 기록
+                for key in chunk:
+                    results[key] = (None, e)
+            # 하위 요청의 속도 제한 오류는 batch 응답 안에 있으므로 여기서 호출 속도 조절에 반영
+            report_batch_outcome([results[key][1] for key in chunk])
+
+            failed.extend(
+                key for key in chunk
+                if results[key][1] is not None and _is_retryable_error(results[key][1])
+            )
+        pending = failed
+
+    return results
@@ -1,27 +1,98 @@
 import os
-import requests
+import re
+from concurrent.futures import ThreadPoolExecutor
 
-from langchain.tools import tool
+from langchain_core.tools import tool
 from utils.utils import sanitize_input
+from utils.cache import TTLCache
+from utils import http_client
+from utils.tracing import bind_current_turn
+
+# ========================================
+# 검색 결과 캐시 (메모리 LRU + SQLite)
+# ========================================
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(6 * 3600)))
+search_cache = TTLCache("search_place", ttl=SEARCH_CACHE_TTL, max_memory_entries=512)
+SEARCH_MAX_WORKERS = int(os.getenv("SEARCH_MAX_WORKERS", "8"))
+# 벤치마크에서 로컬 대체 서버를 가리키도록 변경 가능
+SERPER_SEARCH_URL = os.getenv("SERPER_SEARCH_URL", "https://google.serper.dev/search")
+
+def _normalize_query(query: str) -> str:
+    """대소문자/공백 차이만 있는 검색어를 같은 키로 취급"""
+    return re.sub(r"\s+", " ", sanitize_input(query)).strip().lower()
+
+def search_serper(query: str, gl: str = "kr", hl: str = "ko") -> list:
+    """
+    Serper 검색 결과(organic 상위 3개)를 반환합니다. 같은 검색어는 캐시에서 바로 응답합니다.
+    """
+    normalized = _normalize_query(query)
+    cache_key = f"{gl}|{hl}|{normalized}"
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    headers = {"X-API-KEY": os.getenv("SERPER_API_KEY", "")}
+    params = {"q": sanitize_input(query), "gl": gl, "hl": hl}
+    # 검색은 다시 보내도 안전하므로 429/5xx/읽기 타임아웃에 재시도
+    res = http_client.post(
+        SERPER_SEARCH_URL,
+        headers=headers,
+        json=params,
+        idempotent=True
+    )
+    res.raise_for_status()
+    results = res.json().get("organic", [])[:3]
+    search_cache.set(cache_key, results)
+    return results
 
 @tool
 def search_place(query: str) -> str:
     """
     Google Serper API를 이용한 장소 검색
     """
-    headers = {"X-API-KEY": os.getenv("SERPER_API_KEY", "")}
-    params = {"q": sanitize_input(query), "gl": "kr", "hl": "ko"}
     try:
-        res = requests.post(
-            "https://google.serper.dev/search",
-            headers=headers,
-            json=params
-        )
-        res.raise_for_status()
-        results = res.json().get("organic", [])[:3]
+        results = search_serper(query)
         return "\n".join([
             f"• {item['title']} ({item.get('snippet','')}) – {item['link']}"
             for item in results
         ])
     except Exception as e:
-        return f"⚠️ 검색 오류: {str(e)}"
\ No newline at end of file
+        return f"⚠️ 검색 오류: {str(e)}"
+
+@tool
+def search_places_batch(queries: str) -> str:
+    """
+    여러 장소를 한 번에 동시 검색합니다. 검색어는 ';' 또는 줄바꿈으로 구분합니다.
+    예: 부산 맛집; 해운대 관광지; 광안리 카페
+    """
+    query_list = []
+    for query in re.split(r"[;\n]", queries):
+        query = query.strip()
+        if query and query not in query_list:
+            query_list.append(query)
+    if not query_list:
+        return "⚠️ 검색어를 입력해주세요."
+
+    # 검색어를 동시에 요청 (호스트별 동시 요청 수는 http_client에서 제한)
+    workers = min(len(query_list), SEARCH_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(bind_current_turn(search_serper), query) for query in query_list]
+
+    # 입력 순서대로 합치면서 같은 링크는 한 번만 표시
+    seen_links = set()
+    sections = []
+    for query, future in zip(query_list, futures):
+        try:
+            results = future.result()
+        except Exception as e:
+            sections.append(f"🔎 {query}\n⚠️ 검색 오류: {str(e)}")
+            continue
+        lines = []
+        for item in results:
+            link = item.get("link")
+            if link in seen_links:
+                continue
+            seen_links.add(link)
+            lines.append(f"• {item['title']} ({item.get('snippet','')}) – {link}")
+        sections.append(f"🔎 {query}\n" + ("\n".join(lines) if lines else "(중복 결과 제외)"))
+    return "\n\n".join(sections)
@@ -1,10 +1,106 @@
-
 import os
-import requests
+import hashlib
 from datetime import datetime
 
-from langchain.tools import tool
+from langchain_core.tools import tool
 from utils.utils import format_conversation_for_agent
+from utils.session import get_session_state
+from utils.cache import TTLCache
+from utils import http_client
+
+# 벤치마크에서 로컬 대체 서버를 가리키도록 변경 가능
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+# ========================================
+# 공유 기록 (내용 해시 → Gist)
+# ========================================
+GIST_SHARE_TTL = float(os.getenv("GIST_SHARE_TTL", str(30 * 24 * 3600)))
+PLAN_GIST_DESCRIPTION = "AI 여행 플래너로 생성된 여행 계획"
+# 세션 상태에 이 세션이 마지막으로 공유한 Gist 를 저장하는 키 (계획이 바뀌면 이 Gist 를 수정)
+SESSION_GIST_KEY = "shared_gist"
+
+# "hash:<내용 해시>" → {"gist_id", "url", "filename"}, "gist:<gist_id>" → 현재 내용 해시
+# "handed_out:<gist_id>" → 만든 세션이 아닌 다른 세션에도 URL 을 건넨 Gist (이후 수정하지 않음)
+gist_share_cache = TTLCache("gist_shares", ttl=GIST_SHARE_TTL, max_memory_entries=256)
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def _github_headers(token: str) -> dict:
+    return {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+
+def _lookup_share(digest: str):
+    """이 내용으로 공유된 Gist (이후 다른 내용으로 수정되었으면 None)"""
+    shared = gist_share_cache.get(f"hash:{digest}")
+    if shared and gist_share_cache.get(f"gist:{shared['gist_id']}") == digest:
+        return shared
+    return None
+
+def _remember_share(digest: str, shared: dict):
+    gist_share_cache.set(f"hash:{digest}", shared)
+    gist_share_cache.set(f"gist:{shared['gist_id']}", digest)
+    get_session_state()[SESSION_GIST_KEY] = shared
+
+def share_plan_content(plan: str, description: str = PLAN_GIST_DESCRIPTION) -> str:
+    """
+    여행 계획을 Gist 로 공유
+    - 이미 같은 내용을 공유했다면 저장된 URL 을 바로 반환 (네트워크 호출 없음)
+    - 이 세션에서 공유한 Gist 가 있으면 새로 만들지 않고 내용을 수정 (PATCH)
+      단, 다른 세션에도 건넨 Gist 는 그 세션의 링크가 바뀌지 않도록 수정하지 않음
+    - 그 외에는 새 Gist 생성
+    """
+    token = os.getenv("GITHUB_TOKEN", "")
+    if not token:
+        return "❌ GITHUB_TOKEN 환경 변수가 설정되지 않았습니다."
+
+    digest = content_hash(plan)
+    shared = _lookup_share(digest)
+    if shared:
+        owned = get_session_state().get(SESSION_GIST_KEY)
+        if not owned or owned["gist_id"] != shared["gist_id"]:
+            # 다른 세션이 만든 Gist 의 URL 을 건넴 → 만든 세션이 이 Gist 를 덮어쓰지 않도록 표시
+            gist_share_cache.set(f"handed_out:{shared['gist_id']}", True)
+        return f"✅ 이미 공유된 내용입니다 (변경 없음)\n🔗 URL: {shared['url']}\n📄 파일명: {shared['filename']}"
+
+    previous = get_session_state().get(SESSION_GIST_KEY)
+    if previous and gist_share_cache.get(f"handed_out:{previous['gist_id']}"):
+        # 다른 세션도 이 URL 을 갖고 있으므로 수정하지 않고 새 Gist 를 만듦
+        previous = None
+    try:
+        if previous:
+            # 같은 파일명으로 덮어써야 Gist 에 파일이 늘어나지 않음
+            res = http_client.patch(
+                f"{GITHUB_API_URL}/gists/{previous['gist_id']}",
+                json={"description": description, "files": {previous["filename"]: {"content": plan}}},
+                headers=_github_headers(token)
+            )
+            if res.status_code == 200:
+                _remember_share(digest, previous)
+                return f"✅ Gist 업데이트 완료!\n🔗 URL: {previous['url']}\n📄 파일명: {previous['filename']}\n📊 크기: {len(plan)}문자"
+            if res.status_code != 404:
+                return f"❌ Gist 업데이트 실패 (status {res.status_code}): {res.text[:200]}"
+            # 사용자가 Gist 를 삭제한 경우 새로 생성
+
+        filename = f"travel_plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        res = http_client.post(
+            f"{GITHUB_API_URL}/gists",
+            json={"description": description, "public": True, "files": {filename: {"content": plan}}},
+            headers=_github_headers(token)
+        )
+        if res.status_code not in (200, 201):
+            return f"❌ Gist 생성 실패 (status {res.status_code}): {res.text[:200]}"
+        gist_data = res.json()
+        _remember_share(digest, {
+            "gist_id": gist_data.get("id", ""),
+            "url": gist_data.get("html_url", ""),
+            "filename": filename
+        })
+        return f"✅ Gist 생성 완료!\n🔗 URL: {gist_data.get('html_url', '')}\n📄 파일명: {filename}\n📊 크기: {len(plan)}문자"
+    except Exception as e:
+        return f"❌ Gist 생성 중 오류 발생: {e}"
 
 @tool
 def share_gist_tool(input: str) -> str:
@@ -16,18 +112,17 @@ def share_gist_tool(input: str) -> str:
         if not token:
             return "❌ GITHUB_TOKEN 환경 변수가 설정되지 않았습니다."
 
-        if ';' in input and input.count(';') >= 2:
-            parts = input.split(';', 2)
-            filename = parts[0].strip()
-            content = parts[1].strip()
-            description = parts[2].strip()
-        else:
+        if not (';' in input and input.count(';') >= 2):
+            # 내용을 지정하지 않으면 최신 여행 계획을 공유
             plan = format_conversation_for_agent()
             if not plan:
                 return "❌ 저장할 여행 계획을 찾을 수 없습니다."
-            filename = f"travel_plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            content = plan
-            description = "AI로 생성된 여행 계획"
+            return share_plan_content(plan, "AI로 생성된 여행 계획")
+
+        parts = input.split(';', 2)
+        filename = parts[0].strip()
+        content = parts[1].strip()
+        description = parts[2].strip()
 
         payload = {
             "description": description,
@@ -35,12 +130,7 @@ def share_gist_tool(input: str) -> str:
             "files": {filename: {"content": content}}
         }
 
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-
-        res = requests.post("https://api.github.com/gists", json=payload, headers=headers, timeout=30)
+        res = http_client.post(f"{GITHUB_API_URL}/gists", json=payload, headers=_github_headers(token))
         if res.status_code in (200, 201):
             gist_data = res.json()
             gist_url = gist_data.get("html_url", "")
@@ -54,15 +144,12 @@ def share_gist_tool(input: str) -> str:
 @tool
 def share_travel_plan_gist(input: str = "") -> str:
     """
-    현재 여행 계획을 자동으로 Gist에 저장합니다.
+    현재 여행 계획을 자동으로 Gist에 저장합니다. (내용이 같으면 기존 URL, 바뀌었으면 기존 Gist 수정)
     """
     plan = format_conversation_for_agent()
     if not plan:
         return "❌ 저장할 여행 계획을 찾을 수 없습니다. 먼저 여행 계획을 생성해주세요."
-    filename = f"travel_plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-    description = "AI 여행 플래너로 생성된 여행 계획"
-    gist_input = f"{filename};{plan};{description}"
-    return share_gist_tool(gist_input)
+    return share_plan_content(plan)
 
 @tool
 def debug_share_status(input: str = "") -> str:
@@ -75,6 +162,10 @@ def debug_share_status(input: str = "") -> str:
 
     plan = format_conversation_for_agent()
     debug_info.append(f"여행 계획: {'발견됨' if plan else '❌ 없음'}")
+    shared = get_session_state().get(SESSION_GIST_KEY)
+    debug_info.append(f"공유한 Gist: {shared['url'] if shared else '없음'}")
+    if plan:
+        debug_info.append(f"현재 계획 공유 여부: {'공유됨 (변경 없음)' if _lookup_share(content_hash(plan)) else '미공유/변경됨'}")
 
     # 간단하게 '공유해줘' 인텐트 확인
     from intents.intent_detector import detect_intent
@@ -1,20 +1,50 @@
-from datetime import datetime
-from langchain.tools import tool
-from config import llm
-from utils.utils import (
-    parse_korean_date,
-    extract_date_from_input,
-    format_conversation_for_agent
+import os
+import re
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.tools import tool
+from utils.utils import extract_date_from_input
+from utils.plan_parser import DAY_HEADER
+from utils.plan_store import get_latest_plan_version
+from utils.llm_cache import cached_generate
+from utils.streaming import emit_text
+from utils.tracing import span, bind_current_turn
+from utils.session import get_session_state
+from tools.booking_jobs import get_booking_queue, SESSION_JOBS_KEY
+from tools.booking_prefetch import prepare_plan_events, take_booking_prefetch
+
+# 사용자가 새 계획을 명시적으로 요청하면 캐시를 건너뜀
+REGENERATE_WORDS = ("다시", "새로")
+
+# ========================================
+# 여행 계획 생성
+# ========================================
+# 이 일수 이상인 여행은 골격(일자별 지역/테마)을 먼저 만든 뒤 하루씩 동시에 생성
+PLAN_PARALLEL_MIN_DAYS = int(os.getenv("PLAN_PARALLEL_MIN_DAYS", "4"))
+PLAN_DAY_WORKERS = int(os.getenv("PLAN_DAY_WORKERS", "4"))
+
+TRIP_NIGHTS_DAYS = re.compile(r"(\d+)\s*박\s*(\d+)\s*일")
+TRIP_DAYS = re.compile(r"(\d+)\s*일\s*(?:간|동안|짜리)")
+# "6월 20일" 처럼 월 뒤에 오는 숫자는 날짜이므로 여행 일수로 보지 않음
+MONTH_BEFORE = re.compile(r"월\s*$")
+SKELETON_LINE = re.compile(
+    r"^\W*day\s*(\d+)\s*\|\s*(\d{4}-\d{2}-\d{2})?\s*\|\s*([^|]*?)\s*\|\s*(.*?)\s*$",
+    re.IGNORECASE
 )
-from tools.calendar_tools import create_event_tool, check_event_exists
 
-@tool
-def plan_trip_tool(input: str) -> str:
-    """
-    여행 계획표를 생성합니다.
-    """
-    user_specified_date = extract_date_from_input(input)
-    today_str = datetime.now().strftime('%Y-%m-%d')
+def extract_trip_days(user_input: str):
+    """"3박 4일", "7일간" 같은 표현에서 여행 일수 추출 (없으면 None)"""
+    match = TRIP_NIGHTS_DAYS.search(user_input)
+    if match:
+        return int(match.group(2))
+    for match in TRIP_DAYS.finditer(user_input):
+        if not MONTH_BEFORE.search(user_input[:match.start()]):
+            return int(match.group(1))
+    return None
+
+def _generate_single_plan(input: str, today_str: str, user_specified_date: str, bypass: bool) -> str:
+    """전체 일정을 한 번의 LLM 호출로 생성"""
     prompt_plan = f"""
 여행 계획 요청: {input}
 
@@ -44,9 +74,127 @@ Day2 (2025-06-21):
 
 **응답은 반드시 일반 텍스트로만 제공하세요. JSON이나 특수 구조는 사용하지 마세요.**
 """
+    # 채팅 화면에 스트림이 연결되어 있으면 토큰 단위로 바로 보여줌 (같은 요청은 캐시에서 응답)
+    return cached_generate(
+        prompt_plan,
+        tool="plan_trip_tool",
+        context={"today": today_str, "start_date": user_specified_date},
+        bypass=bypass
+    )
+
+def _generate_skeleton(input: str, days: int, today_str: str, user_specified_date: str, bypass: bool) -> list:
+    """일자별 골격 [(일차, 날짜 또는 None, 지역, 테마)] 생성 (짧은 출력이라 빠름)"""
+    prompt_skeleton = f"""
+여행 계획 요청: {input}
+
+- 현재 날짜: {today_str}
+- 사용자 지정 시작 날짜: {user_specified_date or "명시되지 않음"}
+- 여행 일수: {days}일
+
+{days}일 여행의 일자별 골격만 만들어 주세요. 세부 일정은 쓰지 마세요.
+하루에 한 줄씩, 아래 형식으로만 출력하세요:
+Day1 | 2025-06-20 | 지역 | 그날의 테마
+Day2 | 2025-06-21 | 지역 | 그날의 테마
+"""
+    text = cached_generate(
+        prompt_skeleton,
+        tool="plan_trip_skeleton",
+        context={"today": today_str, "start_date": user_specified_date},
+        bypass=bypass,
+        stream_output=False
+    )
+    skeleton = {}
+    for line in text.splitlines():
+        match = SKELETON_LINE.match(line)
+        if match:
+            day = int(match.group(1))
+            skeleton.setdefault(day, (day, match.group(2), match.group(3), match.group(4)))
+    # 시작 날짜가 지정되었으면 그 날짜, 아니면 골격의 Day1 날짜를 기준으로 모든 날짜를 직접 계산
+    # (LLM 이 날짜를 건너뛰거나 빠뜨려도 일자별 머리줄이 연속된 날짜를 갖도록)
+    first_date = user_specified_date or (skeleton[1][1] if 1 in skeleton else None)
     try:
-        response = llm.invoke(prompt_plan)
-        content = response.content if hasattr(response, 'content') else str(response)
+        first = datetime.fromisoformat(first_date) if first_date else None
+    except ValueError:
+        first = None
+    skeleton = {
+        day: (day, (first + timedelta(days=day - 1)).strftime('%Y-%m-%d') if first else None, region, theme)
+        for day, (_, _, region, theme) in skeleton.items()
+    }
+    return [skeleton[day] for day in sorted(skeleton)]
+
+def _generate_day(input: str, skeleton: list, entry: tuple, today_str: str, bypass: bool) -> str:
+    """골격의 하루치 세부 일정 생성 ("DayN (날짜):" 머리줄 포함)"""
+    day, date, region, theme = entry
+    header = f"Day{day} ({date}):"
+    outline = "\n".join(
+        f"Day{d} | {dt} | {r} | {t}" for d, dt, r, t in skeleton
+    )
+    prompt_day = f"""
+여행 계획 요청: {input}
+
+전체 여행 골격 (다른 날과 장소가 겹치지 않게 참고):
+{outline}
+
+이 중 Day{day}의 세부 일정만 작성하세요. (지역: {region}, 테마: {theme})
+- 각 일정마다 정확한 시간, 장소, 활동 포함
+- 각 이벤트 별로 한 줄씩 표현
+- 첫 줄은 반드시 "{header}"
+
+출력 예시:
+{header}
+ - 09:00~10:00 : 호텔 조식 및 출발
+ - 11:00~12:30 : 관광지 방문
+
+**응답은 반드시 일반 텍스트로만 제공하세요. JSON이나 특수 구조는 사용하지 마세요.**
+"""
+    text = cached_generate(
+        prompt_day,
+        tool="plan_trip_day",
+        context={"today": today_str},
+        bypass=bypass,
+        stream_output=False
+    ).strip()
+    # 머리줄을 빠뜨렸거나 다른 일차를 붙인 경우에도 병합 결과의 형식이 유지되도록 정리
+    lines = [line for line in text.splitlines() if not DAY_HEADER.match(line)]
+    return "\n".join([header] + [line for line in lines if line.strip()])
+
+def _generate_parallel_plan(input: str, days: int, today_str: str, user_specified_date: str, bypass: bool):
+    """
+    골격 → 일자별 세부 일정 동시 생성 → 일차 순서대로 병합
+    골격이 정확히 Day1~DayN 이 아니거나 날짜를 정할 수 없으면 None (호출 측에서 한 번에 생성)
+    """
+    with span("plan", "skeleton", days=days):
+        skeleton = _generate_skeleton(input, days, today_str, user_specified_date, bypass)
+    if [entry[0] for entry in skeleton] != list(range(1, days + 1)) or skeleton[0][1] is None:
+        # 빠지거나 더 붙은 일차가 있으면 병합 결과가 요청과 달라지고,
+        # 날짜 없는 머리줄은 예약 시 시작 날짜를 다시 물어야 하므로 한 번에 생성하는 경로 사용
+        return None
+
+    workers = min(len(skeleton), PLAN_DAY_WORKERS)
+    with span("plan", "days", days=len(skeleton), workers=workers), ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(bind_current_turn(_generate_day), input, skeleton, entry, today_str, bypass)
+            for entry in skeleton
+        ]
+        day_texts = [future.result() for future in futures]
+    # 하루씩 동시에 생성했으므로 스트리밍 대신 완성된 계획을 한 번에 표시
+    return emit_text("\n\n".join(day_texts))
+
+@tool
+def plan_trip_tool(input: str) -> str:
+    """
+    여행 계획표를 생성합니다.
+    """
+    user_specified_date = extract_date_from_input(input)
+    today_str = datetime.now().strftime('%Y-%m-%d')
+    bypass = any(word in input for word in REGENERATE_WORDS)
+    try:
+        days = extract_trip_days(input)
+        content = None
+        if days and days >= PLAN_PARALLEL_MIN_DAYS:
+            content = _generate_parallel_plan(input, days, today_str, user_specified_date, bypass)
+        if content is None:
+            content = _generate_single_plan(input, today_str, user_specified_date, bypass)
         if user_specified_date:
             content = f"📅 시작 날짜: {user_specified_date}\n\n{content}"
         return content
@@ -59,59 +207,38 @@ def create_calendar_from_plan(input: str = "") -> str:
     이전 여행 계획을 기반으로 캘린더에 자동 예약합니다.
     """
     user_specified_date = extract_date_from_input(input)
-    plan = format_conversation_for_agent()
-    if not plan:
+    plan_version = get_latest_plan_version()
+    if not plan_version:
         return "❌ 먼저 여행 계획을 생성해주세요. 예: '서울 2박 3일 여행 계획 짜줘'"
 
-    today_str = datetime.now().strftime('%Y-%m-%d')
-    prompt_parse = f"""
-다음 여행 계획을 분석하여 각 일정을 캘린더 이벤트로 변환해주세요:
-
-{plan}
-
-**중요: 날짜 변환 규칙**
-- 현재 날짜: {today_str}
-- 사용자가 지정한 시작 날짜: {user_specified_date or "계획에서 추출"}
-- "25년" = "2025년"으로 해석
-- 사용자가 "{input}"라고 했다면, 명시된 날짜를 정확히 사용
-- 모든 날짜는 정확히 YYYY-MM-DD 형식으로 변환
-- 시간대는 반드시 +09:00 (한국 시간) 사용
-
-각 일정마다 다음 형식으로 출력하세요:
-제목;시작시간;종료시간
-
-예시:
-경복궁 방문;2025-06-20T11:00:00+09:00;2025-06-20T12:30:00+09:00
-인사동 점심;2025-06-20T13:00:00+09:00;2025-06-20T14:00:00+09:00
-
-각 줄마다 하나의 이벤트만 작성하고, 다른 설명은 포함하지 마세요.
-날짜가 불명확한 경우 {user_specified_date or "2025-06-20"}부터 시작하세요.
-
-**응답은 반드시 일반 텍스트로만 제공하세요. JSON이나 특수 구조는 사용하지 마세요.**
-"""
     try:
-        response = llm.invoke(prompt_parse)
-        content = response.content if hasattr(response, 'content') else str(response)
-
-        if user_specified_date and user_specified_date not in content:
-            # Streamlit UI에서는 경고로 처리하지만, 여기서는 문자열로만 반환
-            content = f"⚠️ 사용자 지정 날짜({user_specified_date})가 반영되지 않았습니다.\n\n{content}"
-
-        events_created = []
-        lines = content.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if ';' in line and line.count(';') >= 2:
-                try:
-                    result = create_event_tool(line)
-                    events_created.append(result)
-                except Exception as e:
-                    events_created.append(f"❌ 이벤트 생성 실패: {line} - {e}")
-
-        if events_created:
-            success_msg = f"🗓️ 캘린더 예약 완료 (시작일: {user_specified_date or '계획 기준'}):\n"
-            return success_msg + "\n".join(events_created)
+        # 계획 생성 직후 미리 준비해 둔 결과가 있으면 사용 (파싱/캘린더 조회 생략)
+        prepared = take_booking_prefetch(plan_version, user_specified_date)
+        if prepared is not None:
+            plan_events, errors, content = prepared.plan_events, prepared.errors, prepared.content
         else:
-            return f"❌ 캘린더 이벤트 생성에 실패했습니다.\n파싱 결과: {content}"
+            plan_events, errors, content = prepare_plan_events(plan_version, user_specified_date, input)
+        if not plan_events:
+            return f"❌ 캘린더 이벤트 생성에 실패했습니다.\n파싱 결과: {content}\n" + "\n".join(errors)
+
+        # 실제 등록은 백그라운드 작업으로 처리하고 바로 반환 (에이전트 실행 시간 제한과 무관)
+        job_id = get_booking_queue().submit(
+            plan_events,
+            label=user_specified_date or "",
+            existing=prepared.existing if prepared is not None else None
+        )
+        get_session_state().setdefault(SESSION_JOBS_KEY, []).append(job_id)
+        lines = [
+            f"📨 캘린더 예약 작업을 시작했습니다 (작업 ID: {job_id}, 일정 {len(plan_events)}개, "
+            f"시작일: {user_specified_date or '계획 기준'}).",
+            "진행 상황은 채팅 화면에 표시됩니다.",
+        ]
+        if prepared is not None and prepared.existing is not None:
+            counts = prepared.diff_counts
+            lines.append(
+                f"🔎 미리 확인한 변경: 추가 {counts['insert']} · 수정 {counts['patch']} · "
+                f"삭제 {counts['delete']} · 유지 {counts['noop']}"
+            )
+        return "\n".join(lines + errors)
     except Exception as e:
-        return f"❌ 일정 파싱 실패: {e}"
\ No newline at end of file
+        return f"❌ 일정 파싱 실패: {e}"
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+# ========================================
+# 캐시 저장 위치
+# ========================================
+CACHE_DIR = os.getenv("TRAVEL_PLANNER_CACHE_DIR", ".cache")
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    2단계 결과 캐시
+    - 1단계: 프로세스 내 LRU (OrderedDict)
+    - 2단계: SQLite 디스크 캐시 (프로세스 재시작 후에도 유지)
+    항목마다 만료 시간(TTL)을 두고, 크기 제한을 넘으면 오래 사용하지 않은 항목부터 제거합니다.
+    값은 JSON으로 직렬화 가능한 객체여야 합니다.
+    """
+
+    def __init__(self, name: str, ttl: float = 3600, max_memory_entries: int = 256,
+                 max_disk_bytes: int = 50 * 1024 * 1024, disk: bool = True):
+        self.name = name
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+        self._db = None
+        if disk:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(CACHE_DIR, f"{name}.sqlite"), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+                "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries(accessed_at)")
+            self._db.commit()
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    # ----------------------------------------
+    # 조회 / 저장
+    # ----------------------------------------
+    def get(self, key: str, default=None):
+        """캐시 조회 (메모리 → 디스크 순). 없거나 만료되었으면 default 반환"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (self._hash(key),)
+                ).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        value = json.loads(row[0])
+                        self._db.execute(
+                            "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, self._hash(key))
+                        )
+                        self._db.commit()
+                        self._remember(key, value, row[1])
+                        self._stats["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM entries WHERE key = ?", (self._hash(key),))
+                    self._db.commit()
+
+            self._stats["misses"] += 1
+            return default
+
+    def set(self, key: str, value, ttl: float = None):
+        """캐시에 저장 (ttl을 지정하지 않으면 기본 TTL 사용)"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self._stats["sets"] += 1
+            if self._db is not None:
+                payload = json.dumps(value, ensure_ascii=False)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, expires_at, size, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self._hash(key), payload, expires_at, len(payload.encode("utf-8")), time.time())
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def _remember(self, key: str, value, expires_at: float):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _evict_disk(self):
+        """만료 항목 삭제 후, 크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        self._db.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """적중/미스 카운터와 적중률"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
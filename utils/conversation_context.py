@@ -0,0 +1,159 @@
+import os
+import math
+from functools import lru_cache
+
+from utils.session import get_session_state
+from utils.plan_store import get_latest_plan
+
+# ========================================
+# 인텐트별 프롬프트 토큰 예산
+# (환경 변수 CONTEXT_BUDGET_<인텐트> 로 변경 가능)
+# ========================================
+DEFAULT_CONTEXT_BUDGET = int(os.getenv("CONTEXT_BUDGET_DEFAULT", "1500"))
+INTENT_CONTEXT_BUDGETS = {
+    "PLAN_TRIP": 1500,
+    "BOOK_CALENDAR": 2500,
+    "SHARE_PLAN": 500,
+    "SEARCH_PLACE": 800,
+    "MANAGE_EVENT": 800,
+}
+# 요약되지 않은 오래된 대화가 이만큼 쌓였을 때만 요약을 갱신 (LLM 호출 횟수 제한)
+SUMMARY_MIN_TOKENS = int(os.getenv("CONTEXT_SUMMARY_MIN_TOKENS", "300"))
+SUMMARY_KEY = "context_summary"
+METRICS_KEY = "prompt_metrics"
+
+def get_context_budget(intent: str) -> int:
+    default = INTENT_CONTEXT_BUDGETS.get(intent, DEFAULT_CONTEXT_BUDGET)
+    return int(os.getenv(f"CONTEXT_BUDGET_{intent}", str(default)))
+
+@lru_cache(maxsize=2048)
+def count_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (토크나이저 없이 사용하는 근사치)
+    영문/숫자는 약 4자당 1토큰, 한글 등 비ASCII 문자는 글자당 약 0.7토큰으로 계산합니다.
+    """
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) * 0.7)
+
+def _format_turn(msg: dict) -> str:
+    speaker = "사용자" if msg["role"] == "user" else "어시스턴트"
+    return f"{speaker}: {msg['content']}"
+
+# ========================================
+# 오래된 대화 요약 (세션에 누적 저장)
+# ========================================
+def _summarize(previous_summary: str, turns: list) -> str:
+    from utils.llm_cache import cached_generate
+
+    prompt = f"""
+다음은 여행 플래너 대화의 이전 요약과 그 이후의 대화입니다.
+여행지, 날짜, 사용자의 선호/제약, 이미 완료된 작업(예약, 공유 등)만 5줄 이내로 요약하세요.
+여행 일정표 전체를 옮겨 적지 마세요.
+
+이전 요약:
+{previous_summary or "(없음)"}
+
+이후 대화:
+{chr(10).join(turns)}
+"""
+    try:
+        return cached_generate(prompt, tool="conversation_summary", stream_output=False).strip()
+    except Exception:
+        # 요약에 실패하면 각 발화의 앞부분만 남김
+        clipped = [turn[:80] for turn in turns]
+        return "\n".join(filter(None, [previous_summary] + clipped))
+
+def _rolling_summary(messages: list, cut: int) -> str:
+    """messages[:cut] 를 요약한 텍스트 (이전에 요약한 부분 이후만 새로 반영)"""
+    state = get_session_state()
+    summary = state.get(SUMMARY_KEY) or {"text": "", "upto": 0}
+    pending = [_format_turn(msg) for msg in messages[summary["upto"]:cut]]
+    if pending and sum(count_tokens(turn) for turn in pending) >= SUMMARY_MIN_TOKENS:
+        summary = {"text": _summarize(summary["text"], pending), "upto": cut}
+        state[SUMMARY_KEY] = summary
+    return summary["text"]
+
+# ========================================
+# 프롬프트 컨텍스트 구성
+# ========================================
+def _fit_plan(plan: str, budget: int) -> tuple:
+    """
+    여행 계획 섹션이 예산을 넘으면 앞쪽 줄부터 예산만큼만 남기고 생략 표시를 붙임
+    반환값: (섹션 텍스트, 잘렸는지 여부)
+    """
+    section = f"📋 **여행 계획**\n{plan}"
+    if count_tokens(section) <= budget:
+        return section, False
+    lines = plan.splitlines()
+    kept = []
+    used = count_tokens("📋 **여행 계획**") + count_tokens(f"… (이하 {len(lines)}줄 생략)")
+    for line in lines:
+        tokens = count_tokens(line) + 1
+        if used + tokens > budget:
+            break
+        kept.append(line)
+        used += tokens
+    omitted = len(lines) - len(kept)
+    return "📋 **여행 계획**\n" + "\n".join(kept + [f"… (이하 {omitted}줄 생략)"]), True
+
+def build_conversation_context(intent: str, current_request: str = "") -> str:
+    """
+    인텐트별 토큰 예산 안에서 에이전트에 전달할 컨텍스트를 만듭니다.
+    1) 최신 여행 계획 (항상 포함, 예산을 넘으면 앞부분만)
+    2) 최근 대화 (예산이 남는 만큼 최신순으로)
+    3) 예산 밖의 오래된 대화는 누적 요약으로 대체
+    """
+    state = get_session_state()
+    budget = get_context_budget(intent)
+    messages = list(state.get("messages", []))
+    # 방금 추가된 현재 요청은 프롬프트 끝에 따로 붙으므로 제외
+    if messages and messages[-1]["role"] == "user" and messages[-1]["content"] == current_request:
+        messages = messages[:-1]
+
+    plan = get_latest_plan()
+    plan_truncated = False
+    sections = []
+    if plan:
+        plan_section, plan_truncated = _fit_plan(plan, budget)
+        sections.append(plan_section)
+    used = sum(count_tokens(section) for section in sections)
+
+    recent = []
+    cut = len(messages)
+    for index in range(len(messages) - 1, -1, -1):
+        msg = messages[index]
+        # 최신 계획은 이미 포함했으므로 대화 목록에서는 건너뜀
+        if plan and msg["content"] == plan:
+            cut = index
+            continue
+        turn = _format_turn(msg)
+        tokens = count_tokens(turn)
+        if used + tokens > budget:
+            break
+        recent.append(turn)
+        used += tokens
+        cut = index
+
+    summary = _rolling_summary(messages, cut) if cut > 0 else ""
+    if summary:
+        sections.insert(0, f"🗂️ 이전 대화 요약\n{summary}")
+    if recent:
+        sections.append("💬 최근 대화\n" + "\n".join(reversed(recent)))
+
+    context = "\n\n".join(sections)
+    prompt_tokens = count_tokens(context) + count_tokens(current_request)
+    state.setdefault(METRICS_KEY, []).append({
+        "intent": intent,
+        "prompt_tokens": prompt_tokens,
+        "budget": budget,
+        "summary_tokens": count_tokens(summary) if summary else 0,
+        "recent_turns": len(recent),
+        "plan_truncated": plan_truncated,
+        # 요약 등으로 예산을 넘긴 토큰 수 (0 이면 예산 안)
+        "overrun": max(0, prompt_tokens - budget),
+    })
+    return context
+
+def get_prompt_metrics() -> list:
+    """턴별 프롬프트 토큰 지표 (오래된 순)"""
+    return list(get_session_state().get(METRICS_KEY, []))
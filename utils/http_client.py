@@ -0,0 +1,112 @@
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.tracing import span
+
+# ========================================
+# 공용 HTTP 클라이언트 설정
+# ========================================
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+# 한 호스트로 동시에 나가는 요청 수 제한 (병렬 검색 시 업스트림 429 방지)
+HTTP_MAX_CONCURRENCY_PER_HOST = int(os.getenv("HTTP_MAX_CONCURRENCY_PER_HOST", "4"))
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# 응답을 받은 뒤(5xx/읽기 타임아웃) 다시 보내도 되는 메서드
+# POST(Gist 생성 등)는 서버가 이미 처리했을 수 있어 중복 생성되므로 제외합니다.
+# 검색처럼 여러 번 보내도 되는 POST 는 request(..., idempotent=True) 로 호출합니다.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PATCH", "PUT", "DELETE"})
+
+_sessions = {}
+_session_lock = threading.Lock()
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+class _Retry(Retry):
+    """429 는 서버가 요청을 처리하지 않고 거절한 것이므로 메서드와 관계없이 재시도"""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code == 429 and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+def _build_retry(idempotent: bool = False) -> Retry:
+    """
+    429/5xx에 대해 지터가 섞인 지수 백오프로 재시도 (Retry-After 헤더 우선)
+    idempotent=True 이면 POST 도 5xx/읽기 타임아웃에 재시도합니다.
+    """
+    options = dict(
+        total=HTTP_MAX_RETRIES,
+        status_forcelist=RETRY_STATUS,
+        # None 이면 모든 메서드 재시도
+        allowed_methods=None if idempotent else IDEMPOTENT_METHODS,
+        backoff_factor=0.3,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return _Retry(backoff_jitter=0.5, **options)
+    except TypeError:
+        # urllib3 < 2.0 에는 backoff_jitter 옵션이 없습니다.
+        return _Retry(**options)
+
+def get_session(idempotent: bool = False) -> requests.Session:
+    """
+    프로세스 전역 requests.Session (재시도 정책별로 하나씩)
+    호스트별 keep-alive 커넥션 풀을 재사용하므로 두 번째 호출부터는 TCP/TLS 핸드셰이크가 생략됩니다.
+    """
+    with _session_lock:
+        if idempotent not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                max_retries=_build_retry(idempotent),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "Accept-Encoding": "gzip, deflate",
+                "User-Agent": "ai-travel-planner/1.0",
+            })
+            _sessions[idempotent] = session
+        return _sessions[idempotent]
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    """호스트별 동시 요청 제한용 세마포어"""
+    host = urlsplit(url).netloc
+    with _host_slots_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(HTTP_MAX_CONCURRENCY_PER_HOST)
+        return _host_slots[host]
+
+def request(method: str, url: str, timeout=None, idempotent: bool = False, **kwargs) -> requests.Response:
+    """
+    공용 세션으로 요청 (timeout 미지정 시 기본 connect/read 타임아웃 적용)
+    idempotent=True: 다시 보내도 결과가 같은 요청(예: 검색 POST)이므로 5xx/읽기 타임아웃에도 재시도
+    """
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    host = urlsplit(url).netloc
+    with span("http", host, method=method) as info, _host_slot(url):
+        response = get_session(idempotent).request(method, url, timeout=timeout, **kwargs)
+        info["status"] = response.status_code
+        info["response_bytes"] = len(response.content)
+        return response
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+def patch(url: str, **kwargs) -> requests.Response:
+    return request("PATCH", url, **kwargs)
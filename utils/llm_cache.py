@@ -0,0 +1,79 @@
+import os
+import re
+import json
+import threading
+
+from config import BEDROCK_MODEL_ID
+from utils.cache import TTLCache
+from utils.streaming import generate_text, emit_text
+from utils.tracing import span
+
+# ========================================
+# LLM 응답 캐시 설정
+# ========================================
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+llm_cache = TTLCache(
+    "llm_responses",
+    ttl=LLM_CACHE_TTL,
+    max_memory_entries=128,
+    max_disk_bytes=LLM_CACHE_MAX_BYTES
+)
+
+_tool_stats = {}
+_stats_lock = threading.Lock()
+
+def normalize_prompt(prompt: str) -> str:
+    """줄 끝 공백, 연속 공백, 빈 줄 차이를 무시"""
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in prompt.strip().splitlines()]
+    return "\n".join(line for line in lines if line)
+
+def make_cache_key(prompt: str, context: dict = None) -> str:
+    """모델 ID + 정규화된 프롬프트 + 날짜 등 해석 컨텍스트로 캐시 키 생성"""
+    return json.dumps(
+        [BEDROCK_MODEL_ID, normalize_prompt(prompt), sorted((context or {}).items())],
+        ensure_ascii=False,
+        default=str
+    )
+
+def _count(tool: str, hit: bool):
+    with _stats_lock:
+        stats = _tool_stats.setdefault(tool, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+
+def cached_generate(prompt: str, tool: str, context: dict = None,
+                    bypass: bool = False, stream_output: bool = True) -> str:
+    """
+    LLM 호출 캐시
+    같은 모델/프롬프트/날짜 컨텍스트의 요청은 디스크 캐시에서 즉시 응답합니다.
+    bypass=True(또는 LLM_CACHE_BYPASS 환경 변수)이면 캐시를 읽지 않고 새로 생성한 결과로 덮어씁니다.
+    """
+    key = make_cache_key(prompt, context)
+    if not (bypass or LLM_CACHE_BYPASS):
+        # 캐시 적중은 LLM 호출이 아니므로 별도 종류로 기록 (LLM 지연 통계에 섞이지 않도록)
+        with span("llm_cache", tool, prompt_chars=len(prompt)) as info:
+            cached = llm_cache.get(key)
+            info["cache"] = "hit" if cached is not None else "miss"
+            if cached is not None:
+                _count(tool, hit=True)
+                info["output_chars"] = len(cached)
+                return emit_text(cached) if stream_output else cached
+
+    with span("llm", tool, prompt_chars=len(prompt)) as info:
+        _count(tool, hit=False)
+        text = generate_text(prompt, stream_output=stream_output)
+        info["output_chars"] = len(text)
+        if text:
+            llm_cache.set(key, text)
+        return text
+
+def cache_stats() -> dict:
+    """도구별 적중 횟수와 적중률"""
+    with _stats_lock:
+        stats = {tool: dict(values) for tool, values in _tool_stats.items()}
+    for values in stats.values():
+        lookups = values["hits"] + values["misses"]
+        values["hit_rate"] = values["hits"] / lookups if lookups else 0.0
+    return stats
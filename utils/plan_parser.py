@@ -0,0 +1,126 @@
+import re
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+# ========================================
+# 여행 계획 파서
+# plan_trip_tool 이 요청하는 형식을 LLM 없이 이벤트 레코드로 변환합니다.
+#   Day1 (2025-06-20):
+#    - 09:00~10:00 : 서울역 도착 및 호텔 체크인
+# ========================================
+KST_OFFSET = "+09:00"
+
+DAY_HEADER = re.compile(
+    r"^\W*(?:day\s*(?P<day>\d+)|(?P<kday>\d+)\s*일차)\W*"
+    r"(?:\(?\s*(?P<y>\d{4})[-./](?P<m>\d{1,2})[-./](?P<d>\d{1,2})\s*\)?)?",
+    re.IGNORECASE
+)
+EVENT_LINE = re.compile(
+    r"^\s*(?:[-•*·]\s*)?(\d{1,2}):(\d{2})\s*[~\-–—]\s*(\d{1,2}):(\d{2})\s*[:：\-–—|]?\s*(.+?)\s*$"
+)
+TIME_HINT = re.compile(r"\d{1,2}:\d{2}")
+
+class PlanEvent(NamedTuple):
+    """캘린더 이벤트 1건 (불변, 메모리 사용이 적은 튜플)"""
+    summary: str
+    start: str  # ISO 8601 (+09:00)
+    end: str
+    day: int
+    slot: int
+
+class ParsedPlan(NamedTuple):
+    events: list
+    unparsed: list  # (일차, 날짜 또는 None, 원문 줄) - 시간 정보가 있지만 해석하지 못한 줄
+    start_date: Optional[str]
+
+def _iso(date: datetime, hour: int, minute: int) -> str:
+    moment = date + timedelta(hours=hour, minutes=minute)
+    return moment.strftime("%Y-%m-%dT%H:%M:00") + KST_OFFSET
+
+def _clean_summary(text: str) -> str:
+    # ';'는 "제목;시작;종료" 구분자이므로 제목에서는 ','로 바꿈
+    return re.sub(r"\*\*|__|`", "", text).replace(";", ",").strip(" -:")
+
+def parse_plan(text: str, start_date: str = None) -> ParsedPlan:
+    """
+    여행 계획 텍스트를 PlanEvent 목록으로 변환
+    - 종료 시간이 시작 시간보다 이르면(예: 22:00~02:00) 다음 날 종료로 처리
+    - start_date(YYYY-MM-DD)를 주면 Day1이 그 날짜가 되도록 전체 일정을 이동
+    - 시간 정보가 있지만 형식에 맞지 않는 줄은 unparsed 로 모아 LLM 보정에 사용
+    """
+    events = []
+    unparsed = []
+    day = None
+    day_date = None
+    first_date = None
+    slots = {}
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        header = DAY_HEADER.match(line)
+        if header:
+            day = int(header.group("day") or header.group("kday"))
+            if header.group("y"):
+                day_date = datetime(int(header.group("y")), int(header.group("m")), int(header.group("d")))
+                if first_date is None:
+                    first_date = day_date - timedelta(days=day - 1)
+            elif first_date is None and start_date:
+                # 날짜 없는 헤더만 있으면 사용자가 지정한 시작 날짜를 Day1 로 사용
+                first_date = datetime.fromisoformat(start_date)
+                day_date = first_date + timedelta(days=day - 1)
+            elif first_date is not None:
+                day_date = first_date + timedelta(days=day - 1)
+            else:
+                day_date = None
+            continue
+
+        match = EVENT_LINE.match(line)
+        if day is None or day_date is None or not match:
+            if TIME_HINT.search(line):
+                unparsed.append((day, day_date.strftime("%Y-%m-%d") if day_date else None, line))
+            continue
+
+        start_h, start_m, end_h, end_m = (int(x) for x in match.group(1, 2, 3, 4))
+        if start_h > 24 or end_h > 24 or start_m > 59 or end_m > 59:
+            unparsed.append((day, day_date.strftime("%Y-%m-%d"), line))
+            continue
+        end_offset = end_h * 60 + end_m
+        if end_offset <= start_h * 60 + start_m:
+            end_offset += 24 * 60  # 자정을 넘기는 일정
+        slots[day] = slots.get(day, 0) + 1
+        events.append(PlanEvent(
+            summary=_clean_summary(match.group(5)),
+            start=_iso(day_date, start_h, start_m),
+            end=_iso(day_date, 0, end_offset),
+            day=day,
+            slot=slots[day],
+        ))
+
+    parsed = ParsedPlan(events, unparsed, first_date.strftime("%Y-%m-%d") if first_date else None)
+    if start_date:
+        parsed = shift_plan(parsed, start_date)
+    return parsed
+
+def shift_plan(parsed: ParsedPlan, start_date: str) -> ParsedPlan:
+    """Day1 이 start_date 가 되도록 모든 이벤트 날짜를 이동"""
+    if not parsed.start_date or parsed.start_date == start_date:
+        return parsed
+    delta = datetime.fromisoformat(start_date) - datetime.fromisoformat(parsed.start_date)
+
+    def _shift(value: str) -> str:
+        moment = datetime.fromisoformat(value.replace(KST_OFFSET, "")) + delta
+        return moment.strftime("%Y-%m-%dT%H:%M:00") + KST_OFFSET
+
+    events = [event._replace(start=_shift(event.start), end=_shift(event.end)) for event in parsed.events]
+    unparsed = [
+        (day, (datetime.fromisoformat(date) + delta).strftime("%Y-%m-%d") if date else None, line)
+        for day, date, line in parsed.unparsed
+    ]
+    return ParsedPlan(events, unparsed, start_date)
+
+def to_event_line(event: PlanEvent) -> str:
+    """캘린더 등록용 "제목;시작시간;종료시간" 형식"""
+    return f"{event.summary};{event.start};{event.end}"
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from utils.session import get_session_state
+from utils.plan_parser import parse_plan, EVENT_LINE
+
+# ========================================
+# 여행 계획 인덱스 (세션 상태에 증분 저장)
+# ========================================
+PLAN_INDEX_KEY = "plan_index"
+TRAVEL_KEYWORDS = ["day1", "day 1", "첫날", "첫째날", "1일차", "여행 계획", "일정", "스케줄"]
+EXCLUDE_KEYWORDS = ["캘린더", "예약"]
+
+def is_travel_plan(content: str) -> bool:
+    """여행 계획 메시지인지 판별 (캘린더 예약 결과 등은 제외)"""
+    content_lower = content.lower()
+    has_travel_content = any(pattern in content_lower for pattern in TRAVEL_KEYWORDS)
+    has_exclude_content = any(keyword in content_lower for keyword in EXCLUDE_KEYWORDS)
+    return has_travel_content and not has_exclude_content
+
+def _get_index() -> dict:
+    """
+    계획 인덱스 반환
+    인덱스가 없는 기존 세션이면 메시지 기록을 한 번만 훑어서 만들어 둡니다.
+    """
+    state = get_session_state()
+    if PLAN_INDEX_KEY not in state:
+        index = {"latest": None, "versions": []}
+        state[PLAN_INDEX_KEY] = index
+        for msg in state.get("messages", []):
+            if msg["role"] == "assistant":
+                _record(index, msg["content"])
+    return state[PLAN_INDEX_KEY]
+
+def _has_timed_rows(parsed) -> bool:
+    """
+    시간이 있는 일정 줄이 있는지 확인
+    날짜 없는 헤더(Day1:)의 일정은 예약 시 시작 날짜를 받아야 이벤트가 되므로 unparsed 에 있어도 인정합니다.
+    (일정 조회 결과처럼 DayN 헤더도 "09:00~10:00" 형식도 아닌 줄은 제외)
+    """
+    if parsed.events:
+        return True
+    return any(day is not None or EVENT_LINE.match(line) for day, _, line in parsed.unparsed)
+
+def _record(index: dict, content) -> bool:
+    if not isinstance(content, str):
+        content = str(content)
+    if not is_travel_plan(content):
+        return False
+    # 계획이 생성되는 시점에 한 번만 이벤트로 파싱해 둠 (예약 시 LLM 호출 불필요)
+    parsed = parse_plan(content)
+    if not _has_timed_rows(parsed):
+        # "예정된 일정이 없습니다." 같은 상태 메시지가 최신 계획을 덮어쓰지 않도록
+        # 시간이 있는 일정 줄을 하나 이상 포함한 메시지만 계획으로 인정
+        return False
+    version = {
+        "version": len(index["versions"]) + 1,
+        "content": content,
+        "parsed": parsed,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    index["versions"].append(version)
+    index["latest"] = version
+    return True
+
+def record_assistant_message(content) -> bool:
+    """어시스턴트 메시지가 추가될 때 한 번만 호출. 여행 계획이면 새 버전으로 저장"""
+    return _record(_get_index(), content)
+
+def append_assistant_message(content: str) -> bool:
+    """어시스턴트 메시지를 대화 기록에 추가하고 계획 인덱스를 갱신 (새 계획이면 True)"""
+    state = get_session_state()
+    _get_index()
+    state["messages"].append({"role": "assistant", "content": content})
+    return record_assistant_message(content)
+
+def get_latest_plan():
+    """가장 최근 여행 계획 (없으면 None) - O(1)"""
+    latest = _get_index()["latest"]
+    return latest["content"] if latest else None
+
+def get_latest_plan_version():
+    """가장 최근 여행 계획 버전 (content, parsed 등 포함, 없으면 None)"""
+    return _get_index()["latest"]
+
+def get_plan_versions() -> list:
+    """지금까지 생성된 여행 계획 버전 목록 (오래된 순)"""
+    return list(_get_index()["versions"])
@@ -0,0 +1,22 @@
+import contextvars
+from contextlib import contextmanager
+
+# 벤치마크/헤드리스 실행처럼 Streamlit 런타임 밖에서 사용할 세션 상태
+_bound_state = contextvars.ContextVar("session_state", default=None)
+
+def get_session_state():
+    """현재 세션 상태 (bind_session 으로 지정된 상태가 없으면 Streamlit 세션의 st.session_state)"""
+    state = _bound_state.get()
+    if state is not None:
+        return state
+    import streamlit as st
+    return st.session_state
+
+@contextmanager
+def bind_session(state: dict):
+    """이 블록 안에서 get_session_state() 가 state 를 반환하도록 지정"""
+    token = _bound_state.set(state)
+    try:
+        yield state
+    finally:
+        _bound_state.reset(token)
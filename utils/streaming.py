@@ -0,0 +1,106 @@
+import time
+import threading
+from contextlib import contextmanager
+
+from config import get_llm
+
+# ========================================
+# 1) 토큰 스트리밍 싱크
+# ========================================
+class TokenStream:
+    """
+    LLM이 생성하는 토큰을 받아 화면 자리표시자(placeholder)에 실시간으로 그려주는 싱크
+    생성 1회마다 첫 토큰까지 걸린 시간(TTFT)과 전체 생성 시간을 기록합니다.
+    """
+
+    def __init__(self, placeholder=None, refresh_interval: float = 0.05):
+        self.placeholder = placeholder
+        self.refresh_interval = refresh_interval
+        self.generations = []
+        self._parts = []
+        self._started_at = None
+        self._first_token_at = None
+        self._rendered_at = 0.0
+
+    def start(self):
+        self._parts = []
+        self._started_at = time.perf_counter()
+        self._first_token_at = None
+
+    def write(self, token: str):
+        if not token:
+            return
+        if self._first_token_at is None:
+            self._first_token_at = time.perf_counter()
+        self._parts.append(token)
+        # 토큰마다 다시 그리면 UI가 느려지므로 일정 간격으로만 갱신
+        now = time.perf_counter()
+        if self.placeholder is not None and now - self._rendered_at >= self.refresh_interval:
+            self.placeholder.markdown("".join(self._parts) + "▌")
+            self._rendered_at = now
+
+    def finish(self) -> str:
+        text = "".join(self._parts)
+        finished_at = time.perf_counter()
+        self.generations.append({
+            "ttft": (self._first_token_at or finished_at) - self._started_at,
+            "total": finished_at - self._started_at,
+            "chars": len(text),
+        })
+        if self.placeholder is not None:
+            self.placeholder.markdown(text)
+        return text
+
+    @property
+    def metrics(self) -> dict:
+        """이번 턴의 생성 지표 (첫 생성의 TTFT, 전체 생성 시간 합계)"""
+        if not self.generations:
+            return {}
+        return {
+            "ttft": self.generations[0]["ttft"],
+            "total": sum(g["total"] for g in self.generations),
+            "generations": len(self.generations),
+        }
+
+_local = threading.local()
+
+@contextmanager
+def stream_to(stream: TokenStream):
+    """이 블록 안에서 generate_text()로 생성되는 텍스트를 stream으로 흘려보냅니다."""
+    previous = getattr(_local, "stream", None)
+    _local.stream = stream
+    try:
+        yield stream
+    finally:
+        _local.stream = previous
+
+def current_stream():
+    return getattr(_local, "stream", None)
+
+# ========================================
+# 2) 스트리밍 생성
+# ========================================
+def generate_text(prompt: str, stream_output: bool = True) -> str:
+    """
+    LLM으로 텍스트 생성
+    활성화된 스트림이 있으면 토큰 단위로 흘려보내고, 최종 텍스트는 그대로 반환합니다.
+    stream_output=False 이면 화면에 보여줄 필요가 없는 내부 호출(예: 일정 파싱)로 보고 스트리밍하지 않습니다.
+    """
+    stream = current_stream() if stream_output else None
+    if stream is None:
+        response = get_llm().invoke(prompt)
+        return response.content if hasattr(response, 'content') else str(response)
+
+    stream.start()
+    for chunk in get_llm().stream(prompt):
+        stream.write(chunk.content if hasattr(chunk, 'content') else str(chunk))
+    return stream.finish()
+
+def emit_text(text: str) -> str:
+    """이미 만들어진 텍스트(예: 캐시 적중)를 활성 스트림에 한 번에 출력"""
+    stream = current_stream()
+    if stream is not None:
+        stream.start()
+        stream.write(text)
+        stream.finish()
+    return text
@@ -0,0 +1,178 @@
+import os
+import json
+import time
+import uuid
+import threading
+import contextvars
+from contextlib import contextmanager
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from utils.cache import CACHE_DIR
+
+# ========================================
+# 트레이스 설정
+# ========================================
+TRACING_ENABLED = os.getenv("TRACING", "1").lower() not in ("0", "false", "no")
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(CACHE_DIR, "traces.jsonl"))
+
+_current_turn = contextvars.ContextVar("current_turn", default=None)
+# 명시적인 "llm" 스팬 안인지 여부 (콜백이 같은 호출을 한 번 더 기록하지 않도록)
+_in_llm_span = contextvars.ContextVar("in_llm_span", default=False)
+_write_lock = threading.Lock()
+
+def _write(record: dict):
+    if not TRACING_ENABLED:
+        return
+    with _write_lock:
+        os.makedirs(os.path.dirname(TRACE_FILE) or ".", exist_ok=True)
+        with open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+# ========================================
+# 1) 턴 / 스팬
+# ========================================
+@contextmanager
+def trace_turn(**attrs):
+    """
+    사용자 요청 1턴을 추적합니다. 블록 안에서 기록된 스팬이 턴 레코드에 모여
+    블록이 끝날 때 JSONL 파일에 한 줄로 저장됩니다.
+    """
+    turn = {
+        "turn_id": uuid.uuid4().hex[:12],
+        "ts": time.time(),
+        "attrs": dict(attrs),
+        "spans": [],
+    }
+    started = time.perf_counter()
+    token = _current_turn.set((turn, started))
+    try:
+        yield turn
+    finally:
+        turn["duration_ms"] = (time.perf_counter() - started) * 1000
+        _current_turn.reset(token)
+        _write(turn)
+
+def _record(kind: str, name: str, started: float, attrs: dict):
+    record = {
+        "kind": kind,
+        "name": name or kind,
+        "start_ms": 0.0,
+        "duration_ms": (time.perf_counter() - started) * 1000,
+        **attrs,
+    }
+    current = _current_turn.get()
+    if current is None:
+        # 턴 밖에서 발생한 호출(백그라운드 작업 등)은 단독 레코드로 저장
+        _write({"ts": time.time(), "spans": [record]})
+        return
+    turn, turn_started = current
+    record["start_ms"] = (started - turn_started) * 1000
+    turn["spans"].append(record)
+
+@contextmanager
+def span(kind: str, name: str = None, **attrs):
+    """
+    구간 소요 시간을 기록합니다. yield 된 dict 에 크기·결과 등 속성을 추가할 수 있습니다.
+        with span("calendar", "events.list") as info:
+            info["items"] = len(items)
+    """
+    info = dict(attrs)
+    started = time.perf_counter()
+    token = _in_llm_span.set(True) if kind == "llm" else None
+    try:
+        yield info
+        info.setdefault("outcome", "ok")
+    except Exception as e:
+        info["outcome"] = f"error:{type(e).__name__}"
+        raise
+    finally:
+        if token is not None:
+            _in_llm_span.reset(token)
+        _record(kind, name, started, info)
+
+def bind_current_turn(fn):
+    """스레드 풀에 넘길 함수가 현재 턴에 스팬을 기록하도록 컨텍스트를 함께 전달"""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+# ========================================
+# 2) 에이전트 반복/LLM/도구 호출 추적 콜백
+# ========================================
+class TracingCallbackHandler(BaseCallbackHandler):
+    """agent.run(callbacks=[...]) 로 전달하면 에이전트 내부 단계를 스팬으로 기록"""
+
+    def __init__(self):
+        self._started = {}
+        self._step_started = time.perf_counter()
+        self._steps = 0
+
+    # 도구 안에서 cached_generate 가 span("llm", ...) 으로 이미 기록하는 호출은 건너뜀
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        if not _in_llm_span.get():
+            self._started[run_id] = (time.perf_counter(), sum(len(p) for p in prompts))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        if not _in_llm_span.get():
+            self._started[run_id] = (time.perf_counter(), sum(len(str(m)) for batch in messages for m in batch))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        if run_id not in self._started:
+            return
+        started, prompt_chars = self._started.pop(run_id)
+        output_chars = sum(len(g.text) for gens in response.generations for g in gens)
+        _record("llm", "agent", started, {"prompt_chars": prompt_chars, "output_chars": output_chars, "outcome": "ok"})
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        if run_id not in self._started:
+            return
+        started, prompt_chars = self._started.pop(run_id)
+        _record("llm", "agent", started, {"prompt_chars": prompt_chars, "outcome": f"error:{type(error).__name__}"})
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._started[run_id] = (time.perf_counter(), (serialized or {}).get("name", "tool"))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        started, name = self._started.pop(run_id, (time.perf_counter(), "tool"))
+        _record("tool", name, started, {"output_chars": len(str(output)), "outcome": "ok"})
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        started, name = self._started.pop(run_id, (time.perf_counter(), "tool"))
+        _record("tool", name, started, {"outcome": f"error:{type(error).__name__}"})
+
+    def on_agent_action(self, action, **kwargs):
+        self._steps += 1
+        _record("agent_step", f"step{self._steps}", self._step_started, {"tool": action.tool, "outcome": "ok"})
+        self._step_started = time.perf_counter()
+
+    def on_agent_finish(self, finish, **kwargs):
+        self._steps += 1
+        _record("agent_step", f"step{self._steps}", self._step_started, {"tool": "final_answer", "outcome": "ok"})
+
+# ========================================
+# 3) 집계
+# ========================================
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize_turn(turn: dict) -> dict:
+    """스팬 종류별 소요 시간 합계 (ms)"""
+    totals = {}
+    for record in turn.get("spans", []):
+        totals[record["kind"]] = totals.get(record["kind"], 0.0) + record["duration_ms"]
+    return totals
+
+def span_percentiles(turns: list) -> dict:
+    """스팬 종류별 횟수와 p50/p95 (ms)"""
+    durations = {}
+    for turn in turns:
+        for record in turn.get("spans", []):
+            durations.setdefault(record["kind"], []).append(record["duration_ms"])
+    return {
+        kind: {"count": len(values), "p50": _percentile(values, 50), "p95": _percentile(values, 95)}
+        for kind, values in durations.items()
+    }
@@ -1,8 +1,13 @@
 import re
 import json
+import logging
 from datetime import datetime, timedelta
-import streamlit as st
-from langchain.schema import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage
+
+from utils.session import get_session_state
+from utils.plan_store import get_latest_plan
+
+logger = logging.getLogger(__name__)
 
 # ========================================
 # 1) 메모리 관리 함수
@@ -21,7 +26,7 @@ def safe_add_message_to_memory(memory, message):
             try:
                 memory.chat_memory.messages.append(message)
             except Exception as e:
-                st.warning(f"메모리 추가 실패: {e}")
+                logger.warning("메모리 추가 실패: %s", e)
 
 # ========================================
 # 2) 파싱 오류 처리 함수
@@ -67,34 +72,14 @@ def extract_actual_response(response_text: str) -> str:
 # 3) 대화 컨텍스트 포맷팅 함수
 # ========================================
 def format_conversation_for_agent():
-    """대화에서 여행 계획 추출"""
-    if "messages" not in st.session_state:
+    """대화에서 여행 계획 추출 (가장 최근 계획 하나만)"""
+    if "messages" not in get_session_state():
         return None
-    
-    travel_content = []
-        
-    # 최근 메시지부터 역순으로 검색
-    for msg in reversed(st.session_state.messages):
-        if msg["role"] == "assistant":
-            content = msg["content"]
-            
-            # content가 문자열인지 확인
-            if not isinstance(content, str):
-                content = str(content)
-            
-            # 여행 계획 내용 확인 (수정된 부분)
-            travel_keywords = ["day1", "day 1", "첫날", "첫째날", "1일차", "여행 계획", "일정", "스케줄"]
-            exclude_keywords = ["캘린더", "예약"]
-            
-            has_travel_content = any(pattern in content.lower() for pattern in travel_keywords)
-            has_exclude_content = any(keyword in content.lower() for keyword in exclude_keywords)
-            
-            if has_travel_content and not has_exclude_content:
-                travel_content.append(f"📋 **여행 계획**\n{content}")
-    
-    if travel_content:
-        return "\n\n".join(travel_content)
-        
+
+    plan = get_latest_plan()
+    if plan:
+        return f"📋 **여행 계획**\n{plan}"
+
     return None
 
 # ========================================